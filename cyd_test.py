@@ -84,7 +84,7 @@ def write_log (log_text) :
     elif display is not None :
         display.fill_rectangle (x=0, y=220, w=320, h=20, color=WHITE)
         if sys_font is not None :
-            sys_font.text_sysfont (5, 220, log_text, scale=2, text_color=BLACK)
+            sys_font.text_sysfont (5, 220, log_text, scale=2, text_color=BLACK, background=WHITE)
         else :
             display.draw_text8x8(0, 0, log_text, WHITE, BLACK, 0)
         time.sleep_ms (1000)
@@ -259,8 +259,8 @@ def touchscreen_tests() :
         return
     quit = False
     display.clear(WHITE)
-    sys_font.text_sysfont (5, 5, "Touch Screen", scale=3, text_color=BLACK)
-    sys_font.text_sysfont (5, 210, "   Quit   ", scale=3, text_color=BLACK)
+    sys_font.text_sysfont (5, 5, "Touch Screen", scale=3, text_color=BLACK, background=WHITE)
+    sys_font.text_sysfont (5, 210, "   Quit   ", scale=3, text_color=BLACK, background=WHITE)
     while not quit :
         touch = touchscreen.get_touch()
         if touch is not None :
@@ -269,14 +269,14 @@ def touchscreen_tests() :
             touch_text = f"Touch: x = {x_pos}, y = {y_pos}    "
             write_log (touch_text)
             display.fill_rectangle (5, 50, 310, 20, WHITE)
-            sys_font.text_sysfont (5, 50, touch_text, scale=2, text_color=BLACK)
+            sys_font.text_sysfont (5, 50, touch_text, scale=2, text_color=BLACK, background=WHITE)
             if y_pos >= 210 :
                 write_log ("Touch Screen: Quit")
                 break
             sleep_ms (500)
         sleep_ms (10)
     display.fill_rectangle (5, 210, 310, 20, WHITE)
-    sys_font.text_sysfont (5, 210, "  Goodby  ", scale=3, text_color=BLACK)
+    sys_font.text_sysfont (5, 210, "  Goodby  ", scale=3, text_color=BLACK, background=WHITE)
     sleep_ms (1000)
 
 def sdcard_tests() :
@@ -563,6 +563,6 @@ except Exception as e:
 except KeyboardInterrupt:
     print('Program Interrupted by the user')        
 finally:
-    sysfont.text_sysfont (10, 120, "That's All Folks", scale=3, text_color=BLACK)
+    sysfont.text_sysfont (10, 120, "That's All Folks", scale=3, text_color=BLACK, background=WHITE)
     time.sleep (3)
     #display.cleanup()
@@ -0,0 +1,189 @@
+"""asyncio wrapper that queues Display drawing calls."""
+try:
+    import asyncio
+except ImportError:
+    import uasyncio as asyncio  # type: ignore
+
+_CALL = 0  # Queued display method call
+_STEPS = 1  # Queued iterator, one transfer per step
+_FENCE = 2  # Event set when everything queued before it is drawn
+
+# Display methods that only compute, called directly
+_DIRECT = ('clip_line', 'clip_rect', 'color_run', 'image_buffers',
+           'is_off_grid', 'window_stats')
+# Display methods that read from the display, awaited through call()
+_READS = ('read_block', 'save_region')
+
+
+class AsyncDisplay(object):
+    """Queue Display drawing calls and draw them from a coroutine.
+
+    Display methods called on an AsyncDisplay are queued and return None
+    immediately.  A drain task runs the queue in batches and yields to
+    other tasks between batches, so touch and network tasks keep running
+    during long redraws.  Await fence() or frame() to wait for the
+    drawing to reach the display.  Non-method attributes (width, height,
+    etc.) are read from the display.  Methods that only compute
+    (clip_rect, color_run, etc.) are called directly and return their
+    result.  Reads (read_block, save_region) return a coroutine that is
+    run in queue order; await it for the result.
+
+    Example:
+        adisplay = AsyncDisplay(display)
+        adisplay.start()
+        adisplay.clear()
+        adisplay.draw_image('images/background.raw')
+        adisplay.draw_text8x8(0, 0, 'Ready', WHITE)
+        await adisplay.frame()
+    """
+
+    def __init__(self, display, batch=4):
+        """Constructor for AsyncDisplay.
+
+        Args:
+            display (Display): Display to draw on.
+            batch (int): Display transfers run between yields (default 4).
+        """
+        self.display = display
+        self.batch = batch
+        self.queue = []
+        self.error = None  # First exception raised by a queued call
+        self.frames = 0  # Completed frame() calls
+        self.task = None
+        self._ready = asyncio.Event()
+        self._methods = {}  # Cached queuing wrappers by method name
+
+    def __getattr__(self, name):
+        method = self._methods.get(name)
+        if method is not None:
+            return method
+        attr = getattr(self.display, name)
+        if not callable(attr):
+            return attr
+        if name in _DIRECT:
+            method = attr
+        elif name in _READS:
+            def method(*args, **kwargs):
+                return self.call(name, *args, **kwargs)
+        else:
+            def method(*args, **kwargs):
+                self._put((_CALL, attr, args, kwargs))
+        self._methods[name] = method
+        return method
+
+    def start(self):
+        """Start the drain task (call from a running event loop).
+
+        Returns:
+            (Task): Drain task.
+        """
+        if self.task is None:
+            self.task = asyncio.create_task(self._run())
+        return self.task
+
+    def stop(self):
+        """Cancel the drain task.  Queued calls are kept."""
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+
+    def pending(self):
+        """Return the number of queued items not yet drawn."""
+        return len(self.queue)
+
+    async def call(self, name, *args, **kwargs):
+        """Run a display method in queue order and return its result.
+
+        Args:
+            name (string): Display method name (e.g. 'read_block').
+            *args, **kwargs: Method arguments.
+        Returns:
+            Method result.
+        """
+        result = []
+        method = getattr(self.display, name)
+        self._put((_CALL, lambda: result.append(method(*args, **kwargs)),
+                   (), {}))
+        await self.fence()
+        return result[0] if result else None
+
+    def clear(self, color=0, hlines=8):
+        """Queue a screen clear as bands of hlines rows.
+
+        Args:
+            color (Optional int): RGB565 color value (Default: 0 = Black).
+            hlines (Optional int): Rows per band, a factor of the display
+                height (Default: 8).
+        """
+        self._put((_STEPS, self.display._clear_steps(color, hlines), None,
+                   None))
+
+    def draw_image(self, path, x=0, y=0, w=320, h=240):
+        """Queue an image, read and drawn one chunk per step.
+
+        Args:
+            path (string): Image file path.
+            x (int): X coordinate of image left.  Default is 0.
+            y (int): Y coordinate of image top.  Default is 0.
+            w (int): Width of image.  Default is 320.
+            h (int): Height of image.  Default is 240.
+        """
+        self._put((_STEPS, self.display._image_steps(path, x, y, w, h), None,
+                   None))
+
+    async def fence(self):
+        """Wait until everything queued so far has been drawn.
+
+        Note:
+            Raises the first exception raised by a queued call since the
+            last fence.
+        """
+        event = asyncio.Event()
+        self._put((_FENCE, event, None, None))
+        self.start()
+        await event.wait()
+        error = self.error
+        if error is not None:
+            self.error = None
+            raise error
+
+    async def frame(self):
+        """Flush the off-screen buffer (if any) and wait for the frame."""
+        self._put((_CALL, self.display.flush, (), {}))
+        await self.fence()
+        self.frames += 1
+
+    def _put(self, item):
+        """Queue an item and wake the drain task."""
+        self.queue.append(item)
+        self._ready.set()
+
+    async def _run(self):
+        """Drain task: run queued items, yielding every batch transfers."""
+        count = 0
+        while True:
+            await self._ready.wait()
+            self._ready.clear()
+            while self.queue:
+                items = self.queue
+                self.queue = []
+                for kind, target, args, kwargs in items:
+                    if kind == _FENCE:
+                        target.set()
+                        continue
+                    try:
+                        if kind == _CALL:
+                            target(*args, **kwargs)
+                            count += 1
+                        else:
+                            for _ in target:
+                                count += 1
+                                if count >= self.batch:
+                                    count = 0
+                                    await asyncio.sleep(0)
+                    except Exception as e:
+                        if self.error is None:
+                            self.error = e
+                    if count >= self.batch:
+                        count = 0
+                        await asyncio.sleep(0)
@@ -0,0 +1,274 @@
+"""Benchmark Display drawing primitives.
+
+Runs each primitive across a grid of sizes and reports, per call, wall
+time, SPI bytes, transactions (CS cycles) and net heap bytes (still
+allocated after the call and a collection, the same measure on device
+and on CPython).  Works on device and on a host with the emulator.
+
+On device:
+    from modules import benchmark
+    results = benchmark.run(display, font=unispace)
+    benchmark.save(results, 'bench.json')
+
+On a host:
+    python3 -m modules.benchmark [results.json] [--compare base.json]
+"""
+import gc
+import json
+try:
+    from time import ticks_us, ticks_diff
+except ImportError:  # CPython
+    from time import perf_counter
+
+    def ticks_us():
+        return int(perf_counter() * 1000000)
+
+    def ticks_diff(end, start):
+        return end - start
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+SIZES = (8, 32, 128)  # Shape sizes in pixels
+TEXT_LENGTHS = (4, 16, 40)  # Characters per string
+FIELDS = ('time_us', 'spi_bytes', 'transactions', 'alloc_bytes')
+# Allowed new/old ratios before compare() reports a regression
+THRESHOLDS = {'time_us': 1.25, 'spi_bytes': 1.0, 'transactions': 1.0,
+              'alloc_bytes': 1.10}
+# Smaller increases are timing (or heap layout) noise, never regressions
+MIN_DELTA = {'time_us': 1000, 'alloc_bytes': 256}
+
+
+class CountingSPI(object):
+    """SPI proxy counting bytes written and read."""
+
+    def __init__(self, spi):
+        self.spi = spi
+        self.bytes = 0
+
+    def write(self, data):
+        self.bytes += len(data)
+        self.spi.write(data)
+
+    def readinto(self, buf, *args):
+        self.bytes += len(buf)
+        self.spi.readinto(buf, *args)
+
+    def __getattr__(self, name):
+        return getattr(self.spi, name)
+
+
+class CountingPin(object):
+    """Chip select proxy counting transactions (CS going low)."""
+
+    def __init__(self, pin):
+        self.pin = pin
+        self.count = 0
+
+    def __call__(self, value=None):
+        if value is None:
+            return self.pin()
+        if not value:
+            self.count += 1
+        self.pin(value)
+
+    @property
+    def value(self):  # CircuitPython DigitalInOut
+        return self.pin.value
+
+    @value.setter
+    def value(self, value):
+        if not value:
+            self.count += 1
+        self.pin.value = value
+
+    def __getattr__(self, name):
+        return getattr(self.pin, name)
+
+
+def _alloc_start(function):
+    if tracemalloc is not None:
+        tracemalloc.start()
+        # Trace the objects a call replaces, or their release is missed
+        function()
+    gc.collect()
+    if tracemalloc is not None:
+        return tracemalloc.get_traced_memory()[0]
+    return gc.mem_alloc()
+
+
+def _alloc_end(start):
+    gc.collect()  # Free garbage, as CPython reference counting does
+    if tracemalloc is not None:
+        used = tracemalloc.get_traced_memory()[0] - start
+        tracemalloc.stop()
+    else:
+        used = gc.mem_alloc() - start
+    return max(used, 0)
+
+
+def cases(display, font=None, image_path='bench_image.raw'):
+    """Return the benchmark cases.
+
+    Args:
+        display (Display): Display to draw on.
+        font (XglcdFont object): Font for draw_text (None: skipped).
+        image_path (string): Scratch image file for draw_image.
+    Returns:
+        list: (name, size, function) tuples.
+    """
+    w = display.width
+    h = display.height
+    result = [('clear', w * h, lambda: display.clear(0x0841))]
+    for s in SIZES:
+        s = min(s, w, h)
+        sprite = bytes(range(256)) * (s * s * 2 // 256 + 1)
+        sprite = sprite[:s * s * 2]
+        result += [
+            ('fill_rectangle', s,
+             lambda s=s: display.fill_rectangle(0, 0, s, s, 0xF800)),
+            ('draw_line', s,
+             lambda s=s: display.draw_line(0, 0, s - 1, s // 2, 0x07E0)),
+            ('draw_circle', s, lambda s=s: display.draw_circle(
+                s // 2, s // 2, s // 2 - 1, 0x001F)),
+            ('fill_circle', s, lambda s=s: display.fill_circle(
+                s // 2, s // 2, s // 2 - 1, 0x001F)),
+            ('fill_polygon', s, lambda s=s: display.fill_polygon(
+                7, s // 2, s // 2, s // 2 - 1, 0xFFE0)),
+            ('draw_sprite', s, lambda s=s, sprite=sprite: display.draw_sprite(
+                sprite, 0, 0, s, s)),
+            ('draw_image', s, lambda s=s: display.draw_image(
+                image_path, 0, 0, s, s)),
+        ]
+    for n in TEXT_LENGTHS:
+        text = ('The quick brown fox jumps over the lazy dog ' * 2)[:n]
+        if font is not None:
+            result.append(('draw_text', n, lambda text=text: display.draw_text(
+                0, 0, text, font, 0xFFFF)))
+        result.append(('draw_text8x8', n, lambda text=text:
+                       display.draw_text8x8(0, 0, text, 0xFFFF)))
+    return result
+
+
+def run(display, font=None, repeat=3, image_path='bench_image.raw',
+        verbose=True):
+    """Run the benchmark cases.
+
+    Args:
+        display (Display): Display to draw on.
+        font (XglcdFont object): Font for draw_text (None: skipped).
+        repeat (int): Timed calls per case (results are averages), one
+            more call measures allocations.
+        image_path (string): Scratch image file for draw_image (created
+            and removed).
+        verbose (bool): Print each result.
+    Returns:
+        list: Result dicts with name, size and the FIELDS per call.
+    """
+    side = max(SIZES)
+    with open(image_path, 'wb') as f:
+        row = bytes(range(256)) * (side * 2 // 256 + 1)
+        for _ in range(side):
+            f.write(row[:side * 2])
+    spi, cs = display.spi, display.cs
+    display.spi = counting_spi = CountingSPI(spi)
+    display.cs = counting_cs = CountingPin(cs)
+    results = []
+    try:
+        for name, size, function in cases(display, font, image_path):
+            function()  # Warm up caches and buffers
+            counting_spi.bytes = 0
+            counting_cs.count = 0
+            gc.collect()
+            start = ticks_us()
+            for _ in range(repeat):
+                function()
+            if display.pipeline is not None:
+                display.pipeline.drain()
+            elapsed = ticks_diff(ticks_us(), start)
+            result = {'name': name, 'size': size,
+                      'time_us': elapsed // repeat,
+                      'spi_bytes': counting_spi.bytes // repeat,
+                      'transactions': counting_cs.count // repeat}
+            # Separate call for allocations, tracing slows CPython down
+            alloc = _alloc_start(function)
+            function()
+            result['alloc_bytes'] = _alloc_end(alloc)
+            results.append(result)
+            if verbose:
+                print('{name:14} {size:6} {time_us:9}us {spi_bytes:8}B '
+                      '{transactions:5}tx {alloc_bytes:7}B alloc'.format(
+                          **result))
+    finally:
+        display.spi, display.cs = spi, cs
+        try:
+            import os
+            os.remove(image_path)
+        except OSError:
+            pass
+    return results
+
+
+def save(results, path):
+    """Write results to a JSON file."""
+    with open(path, 'w') as f:
+        json.dump(results, f)
+
+
+def load(path):
+    """Read results from a JSON file."""
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(old, new, thresholds=None):
+    """Compare two runs.
+
+    Args:
+        old (list): Baseline results.
+        new (list): New results.
+        thresholds (dict): Allowed new/old ratio per field (default
+            THRESHOLDS).
+    Returns:
+        list: (name, size, field, old value, new value) regressions.
+    """
+    if thresholds is None:
+        thresholds = THRESHOLDS
+    baseline = {}
+    for result in old:
+        baseline[(result['name'], result['size'])] = result
+    regressions = []
+    for result in new:
+        base = baseline.get((result['name'], result['size']))
+        if base is None:
+            continue
+        for field, ratio in thresholds.items():
+            if result[field] > base[field] * ratio and \
+                    result[field] > base[field] + MIN_DELTA.get(field, 0):
+                regressions.append((result['name'], result['size'], field,
+                                    base[field], result[field]))
+    return regressions
+
+
+if __name__ == '__main__':
+    import sys
+    from modules.emulator import create_display
+    from modules.xglcd_font import XglcdFont
+    args = sys.argv[1:]
+    baseline_path = None
+    if '--compare' in args:
+        i = args.index('--compare')
+        baseline_path = args[i + 1]
+        del args[i:i + 2]
+    bench_display = create_display()[0]
+    bench_font = XglcdFont('modules/Unispace12x24.c', 12, 24)
+    bench_results = run(bench_display, bench_font)
+    if args:
+        save(bench_results, args[0])
+    if baseline_path:
+        found = compare(load(baseline_path), bench_results)
+        for found_name, found_size, found_field, was, now in found:
+            print('REGRESSION {0} {1} {2}: {3} -> {4}'.format(
+                found_name, found_size, found_field, was, now))
+        sys.exit(1 if found else 0)
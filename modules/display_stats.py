@@ -0,0 +1,223 @@
+"""Per-method instrumentation for Display (and fonts or sprite handlers)."""
+try:
+    from time import ticks_us, ticks_diff
+except ImportError:  # CPython
+    from time import perf_counter
+
+    def ticks_us():
+        return int(perf_counter() * 1000000)
+
+    def ticks_diff(end, start):
+        return end - start
+try:
+    from gc import mem_alloc
+except ImportError:  # CPython: heap deltas are not recorded
+    mem_alloc = None
+from modules.benchmark import CountingSPI
+
+
+class DisplayStats(object):
+    """Record calls, SPI bytes, durations and heap deltas per method.
+
+    Public methods are wrapped on the instance only while enabled, so a
+    disabled DisplayStats costs nothing.  Each call is kept in a fixed
+    size ring buffer and added to per-method totals.  Times, bytes and
+    heap deltas of nested calls (e.g. block() inside fill_rectangle())
+    are included in the caller's figures too.
+
+    Example:
+        stats = DisplayStats(display)
+        stats.enable()
+        stats.watch(unispace, 'font.')  # Include glyph building
+        ...draw a screen...
+        print(stats.stats())
+    """
+
+    def __init__(self, display, size=64):
+        """Constructor for DisplayStats.
+
+        Args:
+            display (Display): Display to instrument.
+            size (int): Calls kept in the ring buffer (default 64).
+        """
+        self.display = display
+        self.size = size
+        self.names = [None] * size  # Ring buffer of recent calls
+        self.durations = [0] * size
+        self.byte_counts = [0] * size
+        self.heap_deltas = [0] * size
+        self.index = 0  # Next ring buffer slot
+        self.totals = {}  # name: [calls, total_us, max_us, bytes, heap]
+        self.recording = True
+        self.spi = None  # Counting SPI proxy while enabled
+        self._wrapped = []  # (object, name, previous instance attribute)
+        self.frames = 0
+        self.frame_start = None
+        self.fps = 0
+
+    def enable(self):
+        """Install the wrappers on the display."""
+        if self.spi is not None:
+            return
+        self.spi = CountingSPI(self.display.spi)
+        self.display.spi = self.spi
+        self.watch(self.display)
+
+    def disable(self):
+        """Remove all wrappers (the recorded data is kept)."""
+        for obj, name, previous in reversed(self._wrapped):
+            if previous is None:
+                delattr(obj, name)
+            else:
+                setattr(obj, name, previous)
+        self._wrapped = []
+        if self.spi is not None:
+            self.display.spi = self.spi.spi
+            self.spi = None
+
+    def watch(self, obj, prefix='', names=None):
+        """Record the public methods of another object.
+
+        Args:
+            obj: Object to instrument (e.g. an XglcdFont or SpriteHandler).
+            prefix (string): Prefix for its method names in the stats.
+            names (list): Method names (default: all public methods).
+        Note:
+            Only methods are wrapped: functions of the class, or methods
+            bound to obj and stored on the instance (e.g. Display.write_cmd).
+            Callable attributes such as the cs and dc pins are left alone.
+        """
+        if names is None:
+            names = [name for name in dir(obj) if not name.startswith('_')]
+        instance = getattr(obj, '__dict__', {})
+        cls = type(obj)
+        for name in names:
+            method = getattr(obj, name, None)
+            if not callable(method) or isinstance(method, type):
+                continue
+            if name in instance:
+                if getattr(method, '__self__', None) is not obj:
+                    continue  # Callable attribute (e.g. a Pin)
+            elif not callable(getattr(cls, name, None)):
+                continue
+            previous = instance.get(name)
+            self._wrapped.append((obj, name, previous))
+            setattr(obj, name, self._wrap(prefix + name, method))
+
+    def _wrap(self, name, method):
+        """Return a recording wrapper for a bound method."""
+        def wrapper(*args, **kwargs):
+            if not self.recording:
+                return method(*args, **kwargs)
+            spi = self.spi
+            start_bytes = spi.bytes if spi is not None else 0
+            start_heap = mem_alloc() if mem_alloc is not None else 0
+            start = ticks_us()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self._record(
+                    name, ticks_diff(ticks_us(), start),
+                    (spi.bytes - start_bytes) if spi is not None else 0,
+                    (mem_alloc() - start_heap) if mem_alloc is not None else 0)
+        return wrapper
+
+    def _record(self, name, duration, nbytes, heap):
+        """Add a call to the ring buffer and the totals."""
+        i = self.index
+        self.names[i] = name
+        self.durations[i] = duration
+        self.byte_counts[i] = nbytes
+        self.heap_deltas[i] = heap
+        self.index = (i + 1) % self.size
+        total = self.totals.get(name)
+        if total is None:
+            self.totals[name] = [1, duration, duration, nbytes, heap]
+            return
+        total[0] += 1
+        total[1] += duration
+        if duration > total[2]:
+            total[2] = duration
+        total[3] += nbytes
+        total[4] += heap
+
+    def reset(self):
+        """Clear the totals and the ring buffer."""
+        self.totals = {}
+        self.names = [None] * self.size
+        self.index = 0
+        self.frames = 0
+        self.frame_start = None
+
+    def stats(self):
+        """Return a snapshot of the per-method totals.
+
+        Returns:
+            dict: name: {'calls', 'total_us', 'max_us', 'bytes', 'heap'}.
+        """
+        snapshot = {}
+        for name, total in self.totals.items():
+            snapshot[name] = {'calls': total[0], 'total_us': total[1],
+                              'max_us': total[2], 'bytes': total[3],
+                              'heap': total[4]}
+        return snapshot
+
+    def recent(self):
+        """Return the calls in the ring buffer, oldest first.
+
+        Returns:
+            list: (name, duration_us, bytes, heap_delta) tuples.
+        """
+        calls = []
+        for n in range(self.size):
+            i = (self.index + n) % self.size
+            if self.names[i] is not None:
+                calls.append((self.names[i], self.durations[i],
+                              self.byte_counts[i], self.heap_deltas[i]))
+        return calls
+
+    def frame(self):
+        """Mark the end of a frame and update the frame rate.
+
+        Returns:
+            (float): Frames per second measured over the last second.
+        """
+        now = ticks_us()
+        if self.frame_start is None:
+            self.frame_start = now
+            self.frames = 0
+            return self.fps
+        self.frames += 1
+        elapsed = ticks_diff(now, self.frame_start)
+        if elapsed >= 1000000:
+            self.fps = self.frames * 1000000 / elapsed
+            self.frame_start = now
+            self.frames = 0
+        return self.fps
+
+    def draw_overlay(self, x=0, y=0, color=0xFFE0, background=0):
+        """Draw frame rate and SPI throughput with the 8x8 font.
+
+        Args:
+            x (int): Overlay left.
+            y (int): Overlay top.
+            color (int): RGB565 text color (default: yellow).
+            background (int): RGB565 background color (default: black).
+        Note:
+            Overlay drawing is not recorded.
+        """
+        nbytes = 0
+        total_us = 0
+        for name, total in self.totals.items():
+            if name == 'block':
+                nbytes = total[3]
+                total_us = total[1]
+        rate = nbytes * 1000 // total_us if total_us else 0
+        recording = self.recording
+        self.recording = False
+        try:
+            self.display.draw_text8x8(
+                x, y, '{0:5.1f}fps {1:5}KB/s'.format(self.fps, rate),
+                color, background)
+        finally:
+            self.recording = recording
@@ -0,0 +1,360 @@
+"""Emulated ILI9341 panel for running Display on a host (CPython).
+
+The emulator stands in for machine.SPI and machine.Pin, decodes the
+command stream into a 240x320 RGB565 frame memory and counts SPI
+traffic, so drawing code can be checked and benchmarked without
+hardware.
+
+Example:
+    from modules.emulator import create_display
+    display, panel = create_display()
+    display.fill_circle(160, 120, 50, 0xF800)
+    print(panel.stats(baudrate=40000000))
+    panel.save_png('circle.png')
+"""
+from struct import pack
+import zlib
+
+PANEL_WIDTH = 240  # Frame memory columns
+PANEL_HEIGHT = 320  # Frame memory rows (panel gate lines)
+
+SET_COLUMN = 0x2A
+SET_PAGE = 0x2B
+WRITE_RAM = 0x2C
+READ_RAM = 0x2E
+VSCRDEF = 0x33
+MADCTL = 0x36
+VSCRSADD = 0x37
+WRITE_RAM_CONTINUE = 0x3C
+
+
+class EmulatedPin(object):
+    """machine.Pin replacement that reports CS/DC changes to the panel."""
+
+    OUT = 1
+    IN = 0
+
+    def __init__(self, panel=None, role=None):
+        """Constructor for EmulatedPin.
+
+        Args:
+            panel (Ili9341Emulator): Panel to notify (None = plain pin).
+            role (string): 'cs', 'dc' or None.
+        """
+        self.panel = panel
+        self.role = role
+        self.state = 0
+
+    def init(self, mode=None, value=None):
+        if value is not None:
+            self(value)
+
+    def value(self, value=None):
+        return self(value)
+
+    def __call__(self, value=None):
+        if value is None:
+            return self.state
+        value = 1 if value else 0
+        if self.role == 'cs' and self.state and not value:
+            self.panel.transactions += 1
+        self.state = value
+        return None
+
+    def on(self):
+        self(1)
+
+    def off(self):
+        self(0)
+
+
+class EmulatedSPI(object):
+    """machine.SPI replacement that feeds the panel."""
+
+    def __init__(self, panel):
+        self.panel = panel
+
+    def write(self, data):
+        self.panel.receive(data)
+
+    def readinto(self, buf, write=0):
+        self.panel.send(buf)
+
+    def read(self, nbytes, write=0):
+        buf = bytearray(nbytes)
+        self.panel.send(buf)
+        return buf
+
+    def init(self, *args, **kwargs):
+        pass
+
+    def deinit(self):
+        pass
+
+
+class Ili9341Emulator(object):
+    """ILI9341 frame memory and command decoder.
+
+    Attributes:
+        transactions: CS low periods
+        command_bytes: Bytes sent with DC low
+        data_bytes: Bytes sent with DC high (parameters and pixels)
+        read_bytes: Bytes read back
+        commands: Count per command code
+    Note:
+        Frame memory is addressed as the panel stores it.  MADCTL MV, MX
+        and MY are applied to written and read pixels, and to the image
+        returned by surface()/save_png(), which is in the orientation the
+        display is drawing in.  The BGR bit is ignored.
+    """
+
+    def __init__(self):
+        self.ram = bytearray(PANEL_WIDTH * PANEL_HEIGHT * 2)
+        self.cs = EmulatedPin(self, 'cs')
+        self.dc = EmulatedPin(self, 'dc')
+        self.rst = EmulatedPin()
+        self.spi = EmulatedSPI(self)
+        self.cs.state = 1
+        self.madctl = 0
+        self.columns = (0, PANEL_WIDTH - 1)
+        self.pages = (0, PANEL_HEIGHT - 1)
+        self.scroll_area = (0, PANEL_HEIGHT, 0)  # Top, scroll, bottom rows
+        self.scroll_start = 0
+        self.command = None
+        self.args = bytearray()
+        self.pointer = None  # [column, page] of the next pixel
+        self.read_dummy = False  # Next READ_RAM byte is the dummy byte
+        self.partial_byte = None  # First byte of a split pixel
+        self.reset_counters()
+
+    def reset_counters(self):
+        """Zero the SPI traffic counters."""
+        self.transactions = 0
+        self.command_bytes = 0
+        self.data_bytes = 0
+        self.read_bytes = 0
+        self.commands = {}
+
+    def stats(self, baudrate=40000000, transaction_overhead=0.0):
+        """Return SPI traffic counters and the estimated wire time.
+
+        Args:
+            baudrate (int): SPI clock in Hz (default 40MHz).
+            transaction_overhead (float): Seconds added per transaction
+                for CS/DC toggling and call overhead (default 0).
+        Returns:
+            dict: Counters and 'wire_time' in seconds.
+        """
+        total = self.command_bytes + self.data_bytes + self.read_bytes
+        return {'transactions': self.transactions,
+                'command_bytes': self.command_bytes,
+                'data_bytes': self.data_bytes,
+                'read_bytes': self.read_bytes,
+                'wire_time': total * 8 / baudrate +
+                self.transactions * transaction_overhead}
+
+    def size(self):
+        """Return (width, height) of the drawing orientation."""
+        if self.madctl & 0x20:
+            return PANEL_HEIGHT, PANEL_WIDTH
+        return PANEL_WIDTH, PANEL_HEIGHT
+
+    def _address(self, x, y):
+        """Return the frame memory byte offset of a logical pixel."""
+        madctl = self.madctl
+        if madctl & 0x20:  # MV: exchange rows and columns
+            x, y = y, x
+        if madctl & 0x40:  # MX: column order
+            x = PANEL_WIDTH - 1 - x
+        if madctl & 0x80:  # MY: row order
+            y = PANEL_HEIGHT - 1 - y
+        return (y * PANEL_WIDTH + x) * 2
+
+    def _step(self):
+        """Return the frame memory byte step of one logical pixel in x."""
+        madctl = self.madctl
+        if madctl & 0x20:
+            return -PANEL_WIDTH * 2 if madctl & 0x80 else PANEL_WIDTH * 2
+        return -2 if madctl & 0x40 else 2
+
+    def receive(self, data):
+        """Decode bytes written on the SPI bus."""
+        if self.dc.state == 0:
+            for command in bytes(data):
+                self.command_bytes += 1
+                self.commands[command] = self.commands.get(command, 0) + 1
+                self.command = command
+                self.args = bytearray()
+                self.partial_byte = None
+                if command in (WRITE_RAM, READ_RAM):
+                    self.pointer = [self.columns[0], self.pages[0]]
+                    self.read_dummy = command == READ_RAM
+            return
+        self.data_bytes += len(data)
+        command = self.command
+        if command in (WRITE_RAM, WRITE_RAM_CONTINUE):
+            if self.pointer is None:
+                self.pointer = [self.columns[0], self.pages[0]]
+            self._write_pixels(memoryview(data))
+            return
+        self.args += data
+        args = self.args
+        if command == SET_COLUMN and len(args) >= 4:
+            self.columns = ((args[0] << 8) | args[1], (args[2] << 8) | args[3])
+        elif command == SET_PAGE and len(args) >= 4:
+            self.pages = ((args[0] << 8) | args[1], (args[2] << 8) | args[3])
+        elif command == MADCTL and len(args) >= 1:
+            self.madctl = args[0]
+        elif command == VSCRDEF and len(args) >= 6:
+            self.scroll_area = ((args[0] << 8) | args[1],
+                                (args[2] << 8) | args[3],
+                                (args[4] << 8) | args[5])
+        elif command == VSCRSADD and len(args) >= 2:
+            self.scroll_start = (args[0] << 8) | args[1]
+
+    def _write_pixels(self, data):
+        """Store pixel data at the write pointer, one row segment at once."""
+        if self.partial_byte is not None:
+            data = memoryview(bytes([self.partial_byte]) + bytes(data))
+            self.partial_byte = None
+        if len(data) & 1:
+            self.partial_byte = data[-1]
+            data = data[:-1]
+        ram = self.ram
+        step = self._step()
+        width, height = self.size()
+        pos = 0
+        end = len(data)
+        x0, x1 = self.columns
+        y0, y1 = self.pages
+        while pos < end:
+            x, y = self.pointer
+            n = min(x1 - x + 1, (end - pos) // 2)
+            if 0 <= x and x + n <= width and 0 <= y < height:
+                start = self._address(x, y)
+                stop = start + n * step
+                hi = slice(start, stop if stop >= 0 else None, step)
+                lo = slice(start + 1, stop + 1 if stop + 1 >= 0 else None,
+                           step)
+                ram[hi] = data[pos:pos + n * 2:2]
+                ram[lo] = data[pos + 1:pos + n * 2:2]
+            pos += n * 2
+            x += n
+            if x > x1:
+                x = x0
+                y = y0 if y >= y1 else y + 1
+            self.pointer = [x, y]
+
+    def send(self, buf):
+        """Answer an SPI read (READ_RAM returns a dummy byte, then RGB666)."""
+        self.read_bytes += len(buf)
+        i = 0
+        if self.command != READ_RAM or self.pointer is None:
+            for i in range(len(buf)):
+                buf[i] = 0
+            return
+        if self.read_dummy and len(buf):
+            buf[0] = 0
+            self.read_dummy = False
+            i = 1
+        ram = self.ram
+        x0, x1 = self.columns
+        y0, y1 = self.pages
+        width, height = self.size()
+        while i + 3 <= len(buf):
+            x, y = self.pointer
+            color = 0
+            if 0 <= x < width and 0 <= y < height:
+                a = self._address(x, y)
+                color = (ram[a] << 8) | ram[a + 1]
+            buf[i] = (color >> 8) & 0xF8
+            buf[i + 1] = (color >> 3) & 0xFC
+            buf[i + 2] = (color << 3) & 0xF8
+            i += 3
+            x += 1
+            if x > x1:
+                x = x0
+                y = y0 if y >= y1 else y + 1
+            self.pointer = [x, y]
+
+    def _shown_row(self, row):
+        """Return the frame memory row shown on panel line row."""
+        top, area, bottom = self.scroll_area
+        if top <= row < top + area and area:
+            return top + (self.scroll_start - top + row - top) % area
+        return row
+
+    def pixel(self, x, y):
+        """Return the RGB565 color shown at a pixel of the orientation."""
+        a = self._address(x, y) // 2
+        row = self._shown_row(a // PANEL_WIDTH)
+        a = (row * PANEL_WIDTH + a % PANEL_WIDTH) * 2
+        return (self.ram[a] << 8) | self.ram[a + 1]
+
+    def surface(self):
+        """Return the screen as RGB565 (big endian) in row order.
+
+        Returns:
+            (bytearray): width * height * 2 bytes (see size()).
+        """
+        width, height = self.size()
+        out = bytearray(width * height * 2)
+        pos = 0
+        for y in range(height):
+            for x in range(width):
+                color = self.pixel(x, y)
+                out[pos] = color >> 8
+                out[pos + 1] = color & 0xFF
+                pos += 2
+        return out
+
+    def save_png(self, path):
+        """Save the screen as an 8 bit RGB PNG file.
+
+        Args:
+            path (string): PNG file path.
+        """
+        width, height = self.size()
+        surface = self.surface()
+        raw = bytearray()
+        pos = 0
+        for _ in range(height):
+            raw.append(0)  # Filter: none
+            for _ in range(width):
+                color = (surface[pos] << 8) | surface[pos + 1]
+                pos += 2
+                r = (color >> 11) & 0x1F
+                g = (color >> 5) & 0x3F
+                b = color & 0x1F
+                raw += bytes(((r << 3) | (r >> 2), (g << 2) | (g >> 4),
+                              (b << 3) | (b >> 2)))
+
+        def chunk(kind, data):
+            return pack('>I', len(data)) + kind + data + \
+                pack('>I', zlib.crc32(kind + data) & 0xFFFFFFFF)
+        with open(path, 'wb') as f:
+            f.write(b'\x89PNG\r\n\x1a\n')
+            f.write(chunk(b'IHDR', pack('>IIBBBBB', width, height, 8, 2, 0,
+                                        0, 0)))
+            f.write(chunk(b'IDAT', zlib.compress(bytes(raw), 6)))
+            f.write(chunk(b'IEND', b''))
+
+
+def create_display(width=320, height=240, rotation=90, **kwargs):
+    """Create a Display driving an emulated panel.
+
+    Args:
+        width (int): Display width (default 320).
+        height (int): Display height (default 240).
+        rotation (int): Rotation 0, 90 (default), 180 or 270.
+        **kwargs: Other Display arguments.
+    Returns:
+        (Display, Ili9341Emulator): Display and its panel, with the
+        counters reset after initialization.
+    """
+    from modules.ili9341 import Display
+    panel = Ili9341Emulator()
+    display = Display(panel.spi, panel.cs, panel.dc, panel.rst, width=width,
+                      height=height, rotation=rotation, **kwargs)
+    panel.reset_counters()
+    return display, panel
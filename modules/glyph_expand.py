@@ -0,0 +1,158 @@
+"""Table driven expansion of 1 bit glyphs to RGB565 pixels.
+
+Glyph bits are expanded a byte at a time: a table for each (color,
+background) pair maps every byte value to its 8 pixels (16 bytes of big
+endian RGB565), so a glyph row is built with slice assignments.  Bytes
+are read least significant bit first (bit 0 is the first pixel), the
+order of X-GLCD and SysFont columns and of MONO_HMSB frame buffers.
+
+Column fonts (X-GLCD, SysFont) store a glyph as columns of bytes with
+bit 0 at the top.  columns_to_rows() transposes them once to row bytes
+for portrait text.
+"""
+from modules.lru_cache import LruCache
+
+TABLE_SIZE = 256 * 16  # Bytes per expansion table
+TABLE_CACHE = 8192  # Default budget, two color pairs
+MAX_SCALE = 8  # Largest expand_rows_scaled factor
+
+tables = LruCache(TABLE_CACHE)  # (color, background): table
+
+
+def table(color, background=0):
+    """Return the expansion table of a color pair.
+
+    Args:
+        color (int): RGB565 color of set bits.
+        background (int): RGB565 color of clear bits (default: black).
+    Returns:
+        (memoryview): TABLE_SIZE bytes, 16 per byte value.
+    Note:
+        Tables are cached in tables (LRU) and must not be modified.
+    """
+    key = (color, background)
+    cached = tables.get(key)
+    if cached is not None:
+        return cached
+    pixels = (background.to_bytes(2, 'big'), color.to_bytes(2, 'big'))
+    # 8 bytes (4 pixels) per nibble value
+    nibbles = [b''.join(pixels[(n >> bit) & 1] for bit in range(4))
+               for n in range(16)]
+    data = bytearray(TABLE_SIZE)
+    pos = 0
+    for value in range(256):
+        data[pos:pos + 8] = nibbles[value & 0x0F]
+        data[pos + 8:pos + 16] = nibbles[value >> 4]
+        pos += 16
+    return tables.put(key, memoryview(data))
+
+
+def expand(lut, bits, count, out, pos=0):
+    """Expand count pixels of bit bytes into out.
+
+    Args:
+        lut (memoryview): Expansion table (see table).
+        bits (bytes): Bit bytes, least significant bit first.
+        count (int): Pixels to expand.
+        out (bytearray): Destination pixel buffer.
+        pos (int): Byte offset in out.
+    Returns:
+        (int): Byte offset after the last pixel.
+    """
+    full = count >> 3
+    for i in range(full):
+        b = bits[i] << 4
+        out[pos:pos + 16] = lut[b:b + 16]
+        pos += 16
+    rest = (count & 7) * 2
+    if rest:
+        b = bits[full] << 4
+        out[pos:pos + rest] = lut[b:b + rest]
+        pos += rest
+    return pos
+
+
+def columns_to_rows(columns, width, height):
+    """Transpose column bytes of a glyph to row bytes.
+
+    Args:
+        columns (bytes): height_bytes bytes per column, bit 0 at the top
+            (height_bytes = (height + 7) // 8).
+        width (int): Glyph width (columns).
+        height (int): Glyph height (rows).
+    Returns:
+        (bytearray): (width + 7) // 8 bytes per row, bit 0 at the left.
+    """
+    height_bytes = (height + 7) >> 3
+    row_bytes = (width + 7) >> 3
+    rows = bytearray(row_bytes * height)
+    for x in range(width):
+        mask = 1 << (x & 7)
+        offset = x >> 3
+        i = x * height_bytes
+        for y0 in range(0, height, 8):
+            # Padding bits below the last row are ignored
+            b = columns[i] & ((1 << min(8, height - y0)) - 1)
+            i += 1
+            pos = y0 * row_bytes + offset
+            while b:
+                if b & 1:
+                    rows[pos] |= mask
+                b >>= 1
+                pos += row_bytes
+    return rows
+
+
+def expand_rows(lut, rows, width, height, out):
+    """Expand row bytes of a glyph to a width x height pixel buffer.
+
+    Args:
+        lut (memoryview): Expansion table (see table).
+        rows (bytes): (width + 7) // 8 bytes per row (see columns_to_rows).
+        width (int): Glyph width.
+        height (int): Glyph height.
+        out (bytearray): Destination of at least width * height pixels.
+    """
+    row_bytes = (width + 7) >> 3
+    mv = memoryview(rows)
+    pos = 0
+    for y in range(0, row_bytes * height, row_bytes):
+        pos = expand(lut, mv[y:y + row_bytes], width, out, pos)
+
+
+def expand_rows_scaled(rows, width, height, scale, color, background, out):
+    """Expand row bytes of a glyph scaled up by an integer factor.
+
+    Args:
+        rows (bytes): (width + 7) // 8 bytes per row (see columns_to_rows).
+        width (int): Glyph width.
+        height (int): Glyph height.
+        scale (int): Scale factor 1 to MAX_SCALE.
+        color (int): RGB565 color of set bits.
+        background (int): RGB565 color of clear bits.
+        out (bytearray): Destination of at least width * height * scale^2
+            pixels.
+    Note:
+        Each glyph row is expanded once, a pixel run per bit, then the
+        expanded row is copied for the other scale - 1 rows.
+    """
+    if not 1 <= scale <= MAX_SCALE:
+        raise ValueError('Scale must be 1 to {0}.'.format(MAX_SCALE))
+    if scale == 1:
+        expand_rows(table(color, background), rows, width, height, out)
+        return
+    runs = (background.to_bytes(2, 'big') * scale,
+            color.to_bytes(2, 'big') * scale)
+    run_bytes = scale * 2
+    line = width * run_bytes
+    row_bytes = (width + 7) >> 3
+    mv = memoryview(out)
+    pos = 0
+    for r in range(0, row_bytes * height, row_bytes):
+        start = pos
+        for x in range(width):
+            mv[pos:pos + run_bytes] = runs[(rows[r + (x >> 3)] >> (x & 7)) & 1]
+            pos += run_bytes
+        for _ in range(scale - 1):
+            mv[pos:pos + line] = mv[start:start + line]
+            pos += line
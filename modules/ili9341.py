@@ -1,9 +1,20 @@
 """ILI9341 LCD/Touch module."""
 from time import sleep
 from math import cos, sin, pi, radians
+from struct import pack
 from sys import implementation
-from framebuf import FrameBuffer, RGB565  # type: ignore
-from micropython import const  # type: ignore
+try:
+    from framebuf import FrameBuffer, MONO_HMSB  # type: ignore
+except ImportError:  # CPython (see emulator.py), SysFont draw_text8x8
+    FrameBuffer = MONO_HMSB = None
+try:
+    from micropython import const  # type: ignore
+except ImportError:
+    def const(value):
+        return value
+from modules.lru_cache import LruCache
+from modules.pipeline import BandPipeline
+from modules import glyph_expand, rle565
 
 
 def color565(r, g, b):
@@ -50,7 +61,10 @@ class Display(object):
     VSCRDEF = const(0x33)  # Vertical scrolling definition
     MADCTL = const(0x36)  # Memory access control
     VSCRSADD = const(0x37)  # Vertical scrolling start address
+    IDMOFF = const(0x38)  # Idle mode off
+    IDMON = const(0x39)  # Idle mode on (8 colors)
     PIXFMT = const(0x3A)  # COLMOD: Pixel format set
+    WRITE_RAM_CONTINUE = const(0x3C)  # Memory write continue
     WRITE_DISPLAY_BRIGHTNESS = const(0x51)  # Brightness hardware dependent!
     READ_DISPLAY_BRIGHTNESS = const(0x52)
     WRITE_CTRL_DISPLAY = const(0x53)
@@ -82,6 +96,12 @@ class Display(object):
     ENABLE3G = const(0xF2)  # Enable 3 gamma control
     PUMPRC = const(0xF7)  # Pump ratio control
 
+    FRAME_RATE_MODES = {  # Frame rate control register per display mode
+        'normal': FRMCTR1,
+        'idle': FRMCTR2,
+        'partial': FRMCTR3
+    }
+
     MIRROR_ROTATE = {  # MADCTL configurations for rotation and mirroring
         (False, 0): 0x80,  # 1000 0000
         (False, 90): 0xE0,  # 1110 0000
@@ -94,7 +114,7 @@ class Display(object):
     }
 
     def __init__(self, spi, cs, dc, rst, width=240, height=320, rotation=0,
-                 mirror=False, bgr=True, gamma=True):
+                 mirror=False, bgr=True, gamma=True, fill_cache=12288):
         """Initialize OLED.
 
         Args:
@@ -108,6 +128,8 @@ class Display(object):
             mirror (Optional bool): Mirror display (default False)
             bgr (Optional bool): Swaps red and blue colors (default True)
             gamma (Optional bool): Custom gamma correction (default True)
+            fill_cache (Optional int): Bytes of RAM for cached color runs
+                used by fills (default 12288, 0 disables the cache)
         """
         self.spi = spi
         self.cs = cs
@@ -115,6 +137,31 @@ class Display(object):
         self.rst = rst
         self.width = width
         self.height = height
+        self.buffer = None  # Optional off-screen buffer (see enable_buffer)
+        self.buffer_mv = None
+        self.pipeline = None  # Optional band pipeline (see enable_pipeline)
+        self.dirty = []  # Dirty rectangles [x0, y0, x1, y1] awaiting flush
+        self.dirty_max = 8  # Dirty rectangles kept before merging all
+        self.diagnostics = False  # Print clipped/rejected primitives
+        self.fill_cache = LruCache(fill_cache)  # Pre-expanded color runs
+        self.image_chunk = None  # Image chunk bytes (None = size from RAM)
+        self._image_buffers = None  # Two reusable image chunk buffers
+        self.clip_count = 0  # Primitives clipped or rejected at the edges
+        self.partial = None  # Partial mode band (start, end) or None
+        self.idle = False  # Idle (8 color) mode
+        # Preallocated buffers for the command path (no per-call allocation)
+        self._cmd_buf = bytearray(1)
+        self._column_buf = bytearray(4)
+        self._page_buf = bytearray(4)
+        self._pixel_buf = bytearray(2)
+        self._args_buf = bytearray(16)  # Command parameters (gamma: 15)
+        self._args_mv = memoryview(self._args_buf)
+        # Address window cache: [x0, x1, next row, page start] or None
+        self._window = None
+        self._rotations = {}  # Clockwise rotation: MADCTL (see draw_rotated)
+        self.cache_window = True  # Skip redundant window commands
+        self.window_commands = 0  # SET_COLUMN/SET_PAGE commands sent
+        self.window_elided = 0  # SET_COLUMN/SET_PAGE commands skipped
         if (mirror, rotation) not in self.MIRROR_ROTATE:
             raise ValueError('Rotation must be 0, 90, 180 or 270.')
         else:
@@ -130,6 +177,9 @@ class Display(object):
             self.reset = self.reset_cpy
             self.write_cmd = self.write_cmd_cpy
             self.write_data = self.write_data_cpy
+            self.write_window = self.write_window_cpy
+            self.write_end = self.write_end_cpy
+            self.read_ram = self.read_ram_cpy
         else:
             self.cs.init(self.cs.OUT, value=1)
             self.dc.init(self.dc.OUT, value=0)
@@ -137,6 +187,9 @@ class Display(object):
             self.reset = self.reset_mpy
             self.write_cmd = self.write_cmd_mpy
             self.write_data = self.write_data_mpy
+            self.write_window = self.write_window_mpy
+            self.write_end = self.write_end_mpy
+            self.read_ram = self.read_ram_mpy
         self.reset()
         # Send initialization commands
         self.write_cmd(self.SWRESET)  # Software reset
@@ -180,13 +233,279 @@ class Display(object):
             x1 (int):  Ending X position.
             y1 (int):  Ending Y position.
             data (bytes): Data buffer to write.
+        Note:
+            Blocks that extend past the display are clipped, only the
+            visible sub-rectangle of data is sent.
+            When buffering is enabled (see enable_buffer) blocks inside the
+            buffer region are drawn to RAM and sent to the display by flush.
+            When the pipeline is enabled (see enable_pipeline) data is
+            copied to a band slot and sent while the caller continues.
+        """
+        offset = 0
+        stride = (x1 - x0 + 1) * 2
+        if x0 < 0 or y0 < 0 or x1 >= self.width or y1 >= self.height:
+            clipped = self.clip_rect(x0, y0, x1, y1)
+            if clipped is None:
+                return
+            cx0, cy0, x1, y1 = clipped
+            offset = (cy0 - y0) * stride + (cx0 - x0) * 2
+            x0, y0 = cx0, cy0
+        if self.buffer is not None:
+            bx0, by0, bx1, by1 = self.buffer_rect
+            if x0 >= bx0 and y0 >= by0 and x1 <= bx1 and y1 <= by1:
+                self._buffer_copy(x0, y0, x1, y1, data, offset, stride)
+                self._mark_dirty(x0, y0, x1, y1)
+                return
+            if x0 <= bx1 and x1 >= bx0 and y0 <= by1 and y1 >= by0:
+                # Partly buffered: keep the buffer current and write through
+                cx0 = max(x0, bx0)
+                cy0 = max(y0, by0)
+                self._buffer_copy(cx0, cy0, min(x1, bx1), min(y1, by1), data,
+                                  offset + (cy0 - y0) * stride +
+                                  (cx0 - x0) * 2,
+                                  stride)
+        if self.pipeline is not None:
+            self.pipeline.block(x0, y0, x1, y1, data, offset, stride)
+            return
+        self._send_block(x0, y0, x1, y1, data, offset, stride)
+
+    def _send_block(self, x0, y0, x1, y1, data, offset, stride):
+        """Write pixel data to a display rectangle.
+
+        Args:
+            x0, y0, x1, y1 (int): Display rectangle (inside the display).
+            data (bytes): Source pixel data.
+            offset (int): Byte offset of the first source pixel.
+            stride (int): Bytes per source row.
+        """
+        row_bytes = (x1 - x0 + 1) * 2
+        if row_bytes == stride:
+            end = offset + row_bytes * (y1 - y0 + 1)
+            if offset or len(data) > end:
+                # Rows clipped at the bottom would wrap to the window top
+                data = memoryview(data)[offset:end]
+            try:
+                self.write_window(x0, y0, x1, y1)
+                self.spi.write(data)
+            except Exception:
+                self._window = None  # Write pointer unknown
+                raise
+            finally:
+                self.write_end()  # Release CS (and the CircuitPython lock)
+            if len(data) != row_bytes * (y1 - y0 + 1):
+                self._window = None  # Write pointer no longer predictable
+            return
+        # Clipped columns: send the visible part of each row
+        mv = memoryview(data)
+        spi = self.spi
+        try:
+            self.write_window(x0, y0, x1, y1)
+            for _ in range(y1 - y0 + 1):
+                spi.write(mv[offset:offset + row_bytes])
+                offset += stride
+        except Exception:
+            self._window = None  # Write pointer unknown
+            raise
+        finally:
+            self.write_end()
+
+    def _buffer_copy(self, x0, y0, x1, y1, data, offset, stride):
+        """Copy a rectangle of pixel data into the off-screen buffer.
+
+        Args:
+            x0, y0, x1, y1 (int): Display rectangle inside the buffer region.
+            data (bytes): Source pixel data.
+            offset (int): Byte offset of the first source pixel.
+            stride (int): Bytes per source row.
+        """
+        bx0, by0 = self.buffer_rect[0], self.buffer_rect[1]
+        buffer_stride = self.buffer_width * 2
+        row_bytes = (x1 - x0 + 1) * 2
+        pos = (y0 - by0) * buffer_stride + (x0 - bx0) * 2
+        rows = y1 - y0 + 1
+        src = memoryview(data)
+        buf = self.buffer_mv
+        if row_bytes == buffer_stride and stride == row_bytes:
+            size = rows * row_bytes
+            buf[pos:pos + size] = src[offset:offset + size]
+            return
+        for _ in range(rows):
+            buf[pos:pos + row_bytes] = src[offset:offset + row_bytes]
+            pos += buffer_stride
+            offset += stride
+
+    def _mark_dirty(self, x0, y0, x1, y1):
+        """Add a rectangle to the dirty list, merging overlapping ones.
+
+        Args:
+            x0, y0, x1, y1 (int): Display rectangle that changed.
+        """
+        dirty = self.dirty
+        for d in dirty:
+            if x0 >= d[0] and y0 >= d[1] and x1 <= d[2] and y1 <= d[3]:
+                return  # Already covered
+        i = 0
+        while i < len(dirty):
+            d = dirty[i]
+            # Merge rectangles that overlap or touch
+            if x0 <= d[2] + 1 and x1 + 1 >= d[0] and \
+                    y0 <= d[3] + 1 and y1 + 1 >= d[1]:
+                x0 = min(x0, d[0])
+                y0 = min(y0, d[1])
+                x1 = max(x1, d[2])
+                y1 = max(y1, d[3])
+                dirty.pop(i)
+                i = 0
+            else:
+                i += 1
+        dirty.append([x0, y0, x1, y1])
+        if len(dirty) > self.dirty_max:
+            # Too many fragments, collapse to a single bounding rectangle
+            self.dirty = [[min(d[0] for d in dirty), min(d[1] for d in dirty),
+                           max(d[2] for d in dirty), max(d[3] for d in dirty)]]
+
+    def _hspan(self, x0, x1, y, color):
+        """Draw a horizontal run of pixels clipped to the display.
+
+        Args:
+            x0, x1 (int): First and last X position of the run.
+            y (int): Y position.
+            color (int): RGB565 color value.
+        """
+        if y < 0 or y >= self.height:
+            return
+        if x0 < 0:
+            x0 = 0
+        if x1 >= self.width:
+            x1 = self.width - 1
+        if x0 > x1:
+            return
+        self.block(x0, y, x1, y, self.color_run(color, x1 - x0 + 1))
+
+    def _vspan(self, x, y0, y1, color):
+        """Draw a vertical run of pixels clipped to the display.
+
+        Args:
+            x (int): X position.
+            y0, y1 (int): First and last Y position of the run.
+            color (int): RGB565 color value.
+        """
+        if x < 0 or x >= self.width:
+            return
+        if y0 < 0:
+            y0 = 0
+        if y1 >= self.height:
+            y1 = self.height - 1
+        if y0 > y1:
+            return
+        self.block(x, y0, x, y1, self.color_run(color, y1 - y0 + 1))
+
+    def _mirror_runs(self, x0, y0, runs, vertical, color):
+        """Draw runs of one quadrant mirrored into all four quadrants.
+
+        Args:
+            x0, y0 (int): Coordinates of center point.
+            runs ([(int, int, int),...]): (offset, start, end) runs relative
+                to the center.  Horizontal runs are (y, x start, x end),
+                vertical runs are (x, y start, y end).
+            vertical (bool): True if runs are vertical.
+            color (int): RGB565 color value.
+        """
+        span = self._vspan if vertical else self._hspan
+        c_run, c_pos = (y0, x0) if vertical else (x0, y0)
+        for offset, start, end in runs:
+            if start > end:
+                continue
+            for pos in ((c_pos + offset, c_pos - offset) if offset
+                        else (c_pos,)):
+                if start:
+                    if vertical:
+                        span(pos, c_run + start, c_run + end, color)
+                        span(pos, c_run - end, c_run - start, color)
+                    else:
+                        span(c_run + start, c_run + end, pos, color)
+                        span(c_run - end, c_run - start, pos, color)
+                elif vertical:
+                    span(pos, c_run - end, c_run + end, color)
+                else:
+                    span(c_run - end, c_run + end, pos, color)
+
+    def clip_line(self, x1, y1, x2, y2):
+        """Clip a line to the display (Cohen-Sutherland).
+
+        Args:
+            x1, y1 (int): Starting coordinates of the line
+            x2, y2 (int): Ending coordinates of the line
+        Returns:
+            (int, int, int, int): Clipped line or None if not visible.
+        """
+        xmax = self.width - 1
+        ymax = self.height - 1
+
+        def outcode(x, y):
+            code = 0
+            if x < 0:
+                code = 1
+            elif x > xmax:
+                code = 2
+            if y < 0:
+                code |= 4
+            elif y > ymax:
+                code |= 8
+            return code
+
+        code1 = outcode(x1, y1)
+        code2 = outcode(x2, y2)
+        while code1 | code2:
+            if code1 & code2:
+                self._note_clip(x1, y1, x2, y2, True)
+                return None
+            code = code1 or code2
+            dx = x2 - x1
+            dy = y2 - y1
+            if code & 8:
+                x, y = x1 + round(dx * (ymax - y1) / dy), ymax
+            elif code & 4:
+                x, y = x1 + round(dx * -y1 / dy), 0
+            elif code & 2:
+                x, y = xmax, y1 + round(dy * (xmax - x1) / dx)
+            else:
+                x, y = 0, y1 + round(dy * -x1 / dx)
+            if code == code1:
+                x1, y1 = x, y
+                code1 = outcode(x1, y1)
+            else:
+                x2, y2 = x, y
+                code2 = outcode(x2, y2)
+        return x1, y1, x2, y2
+
+    def clip_rect(self, x0, y0, x1, y1):
+        """Clip a rectangle to the display.
+
+        Args:
+            x0, y0 (int): Top left corner.
+            x1, y1 (int): Bottom right corner.
+        Returns:
+            (int, int, int, int): Visible rectangle or None if not visible.
         """
-        self.write_cmd(self.SET_COLUMN,
-                       x0 >> 8, x0 & 0xff, x1 >> 8, x1 & 0xff)
-        self.write_cmd(self.SET_PAGE,
-                       y0 >> 8, y0 & 0xff, y1 >> 8, y1 & 0xff)
-        self.write_cmd(self.WRITE_RAM)
-        self.write_data(data)
+        cx0 = max(x0, 0)
+        cy0 = max(y0, 0)
+        cx1 = min(x1, self.width - 1)
+        cy1 = min(y1, self.height - 1)
+        if cx0 > cx1 or cy0 > cy1:
+            self._note_clip(x0, y0, x1, y1, True)
+            return None
+        if cx0 != x0 or cy0 != y0 or cx1 != x1 or cy1 != y1:
+            self._note_clip(x0, y0, x1, y1, False)
+        return cx0, cy0, cx1, cy1
+
+    def _note_clip(self, x0, y0, x1, y1, rejected):
+        """Count a clipped primitive, print it if diagnostics are on."""
+        self.clip_count += 1
+        if self.diagnostics:
+            print('{0} ({1}, {2})-({3}, {4}) outside {5}x{6}.'.format(
+                'Rejected' if rejected else 'Clipped',
+                x0, y0, x1, y1, self.width, self.height))
 
     def cleanup(self):
         """Clean up resources."""
@@ -209,17 +528,55 @@ class Display(object):
             would be 1, 2, 3, 4, 5, 6, 8, 10, 12, 15, 16, 20, 24, 30, 40, etc.
             Higher values may result in memory allocation errors.
         """
+        for _ in self._clear_steps(color, hlines):
+            pass
+
+    def _clear_steps(self, color, hlines):
+        """Clear the display, yielding after each band (see clear)."""
         w = self.width
         h = self.height
         assert hlines > 0 and h % hlines == 0, (
             "hlines must be a non-zero factor of height.")
+        if self.partial is not None or self.idle:
+            self.normal_mode()  # Full redraw, show the whole screen
         # Clear display
-        if color:
-            line = color.to_bytes(2, 'big') * (w * hlines)
-        else:
-            line = bytearray(w * 2 * hlines)
+        line = self.color_run(color, w * hlines)
         for y in range(0, h, hlines):
             self.block(0, y, w - 1, y + hlines - 1, line)
+            yield
+
+    def color_run(self, color, count):
+        """Return pixel data for count pixels of one color.
+
+        Args:
+            color (int): RGB565 color value.
+            count (int): Number of pixels.
+        Returns:
+            (memoryview): count * 2 bytes of big endian color data.
+        Note:
+            Runs are cached per color in power of 2 length classes
+            (64 bytes minimum) within the fill_cache budget and sliced to
+            size, so repeated fills do not allocate color data.  The data
+            is shared and must not be modified.
+        """
+        nbytes = count * 2
+        size = 64
+        size_class = 6
+        while size < nbytes:
+            size <<= 1
+            size_class += 1
+        key = (size_class << 16) | color
+        run = self.fill_cache.get(key)
+        if run is None:
+            run = self.fill_cache.put(
+                key, memoryview(color.to_bytes(2, 'big') * (size >> 1)))
+        return run[:nbytes]
+
+    def disable_buffer(self):
+        """Flush and release the off-screen buffer (unbuffered drawing)."""
+        self.flush()
+        self.buffer = None
+        self.buffer_mv = None
 
     def display_off(self):
         """Turn display off."""
@@ -229,6 +586,13 @@ class Display(object):
         """Turn display on."""
         self.write_cmd(self.DISPLAY_ON)
 
+    def disable_pipeline(self):
+        """Send pending bands and stop the pipeline worker."""
+        pipeline = self.pipeline
+        if pipeline is not None:
+            self.pipeline = None
+            pipeline.close()
+
     def draw_circle(self, x0, y0, r, color):
         """Draw a circle.
 
@@ -237,32 +601,30 @@ class Display(object):
             y0 (int): Y coordinate of center point.
             r (int): Radius.
             color (int): RGB565 color value.
+        Note:
+            Pixels of one octant that share a row are drawn as a single
+            run, mirrored horizontally and (transposed) vertically.
         """
         f = 1 - r
         dx = 1
         dy = -r - r
         x = 0
         y = r
-        self.draw_pixel(x0, y0 + r, color)
-        self.draw_pixel(x0, y0 - r, color)
-        self.draw_pixel(x0 + r, y0, color)
-        self.draw_pixel(x0 - r, y0, color)
+        runs = []  # (y, x start, x end) runs of the first octant
+        x_start = 0
         while x < y:
             if f >= 0:
+                runs.append((y, x_start, x))
+                x_start = x + 1
                 y -= 1
                 dy += 2
                 f += dy
             x += 1
             dx += 2
             f += dx
-            self.draw_pixel(x0 + x, y0 + y, color)
-            self.draw_pixel(x0 - x, y0 + y, color)
-            self.draw_pixel(x0 + x, y0 - y, color)
-            self.draw_pixel(x0 - x, y0 - y, color)
-            self.draw_pixel(x0 + y, y0 + x, color)
-            self.draw_pixel(x0 - y, y0 + x, color)
-            self.draw_pixel(x0 + y, y0 - x, color)
-            self.draw_pixel(x0 - y, y0 - x, color)
+        runs.append((y, x_start, x))
+        self._mirror_runs(x0, y0, runs, False, color)
+        self._mirror_runs(x0, y0, runs, True, color)
 
     def draw_ellipse(self, x0, y0, a, b, color):
         """Draw an ellipse.
@@ -286,12 +648,9 @@ class Display(object):
         y = b
         px = 0
         py = twoa2 * y
-        # Plot initial points
-        self.draw_pixel(x0 + x, y0 + y, color)
-        self.draw_pixel(x0 - x, y0 + y, color)
-        self.draw_pixel(x0 + x, y0 - y, color)
-        self.draw_pixel(x0 - x, y0 - y, color)
-        # Region 1
+        # Region 1: x steps every pixel, collect horizontal runs
+        runs = []  # (y, x start, x end)
+        x_start = 0
         p = round(b2 - (a2 * b) + (0.25 * a2))
         while px < py:
             x += 1
@@ -299,14 +658,16 @@ class Display(object):
             if p < 0:
                 p += b2 + px
             else:
+                runs.append((y, x_start, x - 1))
+                x_start = x
                 y -= 1
                 py -= twoa2
                 p += b2 + px - py
-            self.draw_pixel(x0 + x, y0 + y, color)
-            self.draw_pixel(x0 - x, y0 + y, color)
-            self.draw_pixel(x0 + x, y0 - y, color)
-            self.draw_pixel(x0 - x, y0 - y, color)
-        # Region 2
+        runs.append((y, x_start, x))
+        self._mirror_runs(x0, y0, runs, False, color)
+        # Region 2: y steps every pixel, collect vertical runs
+        runs = []  # (x, y start, y end)
+        y_end = y - 1
         p = round(b2 * (x + 0.5) * (x + 0.5) +
                   a2 * (y - 1) * (y - 1) - a2 * b2)
         while y > 0:
@@ -315,13 +676,13 @@ class Display(object):
             if p > 0:
                 p += a2 - py
             else:
+                runs.append((x, y + 1, y_end))
+                y_end = y
                 x += 1
                 px += twob2
                 p += a2 - py + px
-            self.draw_pixel(x0 + x, y0 + y, color)
-            self.draw_pixel(x0 - x, y0 + y, color)
-            self.draw_pixel(x0 + x, y0 - y, color)
-            self.draw_pixel(x0 - x, y0 - y, color)
+        runs.append((x, y, y_end))
+        self._mirror_runs(x0, y0, runs, True, color)
 
     def draw_hline(self, x, y, w, color):
         """Draw a horizontal line.
@@ -332,10 +693,7 @@ class Display(object):
             w (int): Width of line.
             color (int): RGB565 color value.
         """
-        if self.is_off_grid(x, y, x + w - 1, y):
-            return
-        line = color.to_bytes(2, 'big') * w
-        self.block(x, y, x + w - 1, y, line)
+        self._hspan(x, x + w - 1, y, color)
 
     def draw_image(self, path, x=0, y=0, w=320, h=240):
         """Draw image from flash.
@@ -346,31 +704,76 @@ class Display(object):
             y (int): Y coordinate of image top.  Default is 0.
             w (int): Width of image.  Default is 320.
             h (int): Height of image.  Default is 240.
+        Note:
+            The image is streamed with readinto() through the image chunk
+            buffer (see image_buffers).  With a threaded pipeline (see
+            enable_pipeline) chunks are read straight into the free band
+            slot while the worker sends the other one.
         """
+        for _ in self._image_steps(path, x, y, w, h):
+            pass
+
+    def _image_steps(self, path, x, y, w, h):
+        """Draw an image file, yielding after each chunk (see draw_image)."""
         x2 = x + w - 1
         y2 = y + h - 1
-        if self.is_off_grid(x, y, x2, y2):
+        visible = self.clip_rect(x, y, x2, y2)
+        if visible is None:
             return
+        row_bytes = w * 2
+        pipeline = self.pipeline
+        if pipeline is not None and pipeline.threaded and \
+                self.buffer is None and x >= 0 and x2 < self.width and \
+                row_bytes <= pipeline.size:
+            buf = None  # Read into the pipeline slots
+            chunk_height = pipeline.size // row_bytes
+        else:
+            pipeline = None
+            buf = self.image_buffers()[0]
+            chunk_height = len(buf) // row_bytes
+            if chunk_height == 0:
+                # Row wider than the chunk buffer
+                buf = memoryview(bytearray(row_bytes))
+                chunk_height = 1
         with open(path, "rb") as f:
-            chunk_height = 1024 // w
-            chunk_count, remainder = divmod(h, chunk_height)
-            chunk_size = chunk_height * w * 2
-            chunk_y = y
-            if chunk_count:
-                for c in range(0, chunk_count):
-                    buf = f.read(chunk_size)
-                    self.block(x, chunk_y,
-                               x2, chunk_y + chunk_height - 1,
-                               buf)
-                    chunk_y += chunk_height
-            if remainder:
-                buf = f.read(remainder * w * 2)
-                self.block(x, chunk_y,
-                           x2, chunk_y + remainder - 1,
-                           buf)
+            # Skip rows above and below the display, columns are clipped
+            # by block()
+            if visible[1] > y:
+                f.seek((visible[1] - y) * row_bytes)
+                y = visible[1]
+            h = visible[3] - y + 1
+            while h > 0:
+                rows = min(chunk_height, h)
+                if pipeline is not None:
+                    slot = pipeline.acquire()
+                    n = f.readinto(slot[:rows * row_bytes]) or 0
+                    if not n:
+                        break  # End of file
+                    rows = (n + row_bytes - 1) // row_bytes
+                    pipeline.submit(x, y, x2, y + rows - 1, n)
+                else:
+                    n = f.readinto(buf[:rows * row_bytes]) or 0
+                    if not n:
+                        break  # End of file
+                    self.block(x, y, x2, y + rows - 1, buf[:n])
+                y += rows
+                h -= rows
+                yield
+
+    def draw_rle_image(self, path, x=0, y=0):
+        """Draw RLE compressed image from flash (see rle565).
+
+        Args:
+            path (string): Image file path.
+            x (int): X coordinate of image left.  Default is 0.
+            y (int): Y coordinate of image top.  Default is 0.
+        Returns:
+            (int, int): Image width and height.
+        """
+        return rle565.draw(self, path, x, y)
 
     def draw_letter(self, x, y, letter, font, color, background=0,
-                    landscape=False, rotate_180=False):
+                    landscape=False, rotate_180=False, scale=1):
         """Draw a letter.
 
         Args:
@@ -382,21 +785,10 @@ class Display(object):
             background (int): RGB565 background color (default: black)
             landscape (bool): Orientation (default: False = portrait)
             rotate_180 (bool): Rotate text by 180 degrees
+            scale (int): Integer scale factor 1 (default) to 8
         """
-        buf, w, h = font.get_letter(letter, color, background, landscape)
-        if rotate_180:
-            # Manually rotate the buffer by 180 degrees
-            # ensure bytes pairs for each pixel retain color565
-            new_buf = bytearray(len(buf))
-            num_pixels = len(buf) // 2
-            for i in range(num_pixels):
-                # The index for the new buffer's byte pair
-                new_idx = (num_pixels - 1 - i) * 2
-                # The index for the original buffer's byte pair
-                old_idx = i * 2
-                # Swap the pixels
-                new_buf[new_idx], new_buf[new_idx + 1] = buf[old_idx], buf[old_idx + 1]
-            buf = new_buf
+        buf, w, h = font.get_letter(letter, color, background, landscape,
+                                    scale)
 
         # Check for errors (Font could be missing specified letter)
         if w == 0:
@@ -404,16 +796,15 @@ class Display(object):
 
         if landscape:
             y -= w
-            if self.is_off_grid(x, y, x + h - 1, y + w - 1):
-                return 0, 0
-            self.block(x, y,
-                       x + h - 1, y + w - 1,
-                       buf)
+            bw, bh = h, w
+        else:
+            bw, bh = w, h
+        if rotate_180:
+            # Rotated by the display (see draw_rotated)
+            self.draw_rotated(buf, x, y, bw, bh, 180)
         else:
-            if self.is_off_grid(x, y, x + w - 1, y + h - 1):
-                return 0, 0
             self.block(x, y,
-                       x + w - 1, y + h - 1,
+                       x + bw - 1, y + bh - 1,
                        buf)
         return w, h
 
@@ -437,10 +828,11 @@ class Display(object):
                 y1, y2 = y2, y1
             self.draw_vline(x1, y1, y2 - y1 + 1, color)
             return
-        # Confirm coordinates in boundary
-        if self.is_off_grid(min(x1, x2), min(y1, y2),
-                            max(x1, x2), max(y1, y2)):
+        # Clip line to display
+        clipped = self.clip_line(x1, y1, x2, y2)
+        if clipped is None:
             return
+        x1, y1, x2, y2 = clipped
         # Changes in x, y
         dx = x2 - x1
         dy = y2 - y1
@@ -461,16 +853,23 @@ class Display(object):
         error = dx >> 1
         ystep = 1 if y1 < y2 else -1
         y = y1
+        # Pixels sharing a row (or a column if steep) are drawn as one run
+        run_start = x1
         for x in range(x1, x2 + 1):
-            # Had to reverse HW ????
-            if not is_steep:
-                self.draw_pixel(x, y, color)
-            else:
-                self.draw_pixel(y, x, color)
             error -= abs(dy)
             if error < 0:
+                if is_steep:
+                    self._vspan(y, run_start, x, color)
+                else:
+                    self._hspan(run_start, x, y, color)
+                run_start = x + 1
                 y += ystep
                 error += dx
+        if run_start <= x2:
+            if is_steep:
+                self._vspan(y, run_start, x2, color)
+            else:
+                self._hspan(run_start, x2, y, color)
 
     def draw_lines(self, coords, color):
         """Draw multiple lines.
@@ -495,9 +894,12 @@ class Display(object):
             y (int): Y position.
             color (int): RGB565 color value.
         """
-        if self.is_off_grid(x, y, x, y):
+        if x < 0 or y < 0 or x >= self.width or y >= self.height:
             return
-        self.block(x, y, x, y, color.to_bytes(2, 'big'))
+        pixel = self._pixel_buf
+        pixel[0] = color >> 8
+        pixel[1] = color & 0xff
+        self.block(x, y, x, y, pixel)
 
     def draw_polygon(self, sides, x0, y0, r, color, rotate=0):
         """Draw an n-sided regular polygon.
@@ -540,7 +942,116 @@ class Display(object):
         self.draw_vline(x, y, h, color)
         self.draw_vline(x2, y, h, color)
 
-    def draw_sprite(self, buf, x, y, w, h):
+    def draw_rotated(self, buf, x, y, w, h, rotate):
+        """Draw a w x h buffer rotated clockwise.
+
+        Args:
+            buf (bytearray): Pixel data of the unrotated w x h image.
+            x (int): Left of the rotated image.
+            y (int): Top of the rotated image.
+            w (int): Width of the unrotated image.
+            h (int): Height of the unrotated image.
+            rotate (int): Clockwise rotation 90, 180 or 270 (0 = block).
+        Note:
+            The display orientation (MADCTL) is switched to the rotated
+            frame, the unmodified buffer is sent and the orientation is
+            restored.  Partly visible images and buffered drawing use a
+            rotated copy of the pixels instead.
+        """
+        if rotate == 0:
+            self.block(x, y, x + w - 1, y + h - 1, buf)
+            return
+        if rotate not in (90, 180, 270):
+            raise ValueError('Rotation must be 0, 90, 180 or 270.')
+        dw, dh = (w, h) if rotate == 180 else (h, w)
+        width, height = self.width, self.height
+        if self.buffer is not None or x < 0 or y < 0 or \
+                x + dw > width or y + dh > height:
+            self.block(x, y, x + dw - 1, y + dh - 1,
+                       self._rotate_pixels(buf, w, h, rotate))
+            return
+        # Top left of the image in the rotated frame
+        if rotate == 90:
+            x0, y0 = y, width - x - h
+        elif rotate == 180:
+            x0, y0 = width - x - w, height - y - h
+        else:
+            x0, y0 = height - y - w, x
+        self.write_cmd(self.MADCTL, self._rotated_madctl(rotate))
+        if rotate != 180:
+            self.width, self.height = height, width
+        try:
+            self.block(x0, y0, x0 + w - 1, y0 + h - 1, buf)
+        finally:
+            # write_cmd drains pipelined bands before the frame changes back
+            self.write_cmd(self.MADCTL, self.rotation)
+            self.width, self.height = width, height
+
+    def _rotated_madctl(self, rotate):
+        """Return the MADCTL value of the frame rotated clockwise.
+
+        Args:
+            rotate (int): 90, 180 or 270.
+        Returns:
+            (int): MADCTL value (one of MIRROR_ROTATE plus the BGR bit).
+        Note:
+            The frame is the MIRROR_ROTATE entry whose panel addresses
+            match the current frame under the rotation, found once and
+            cached (this also covers mirrored displays).
+        """
+        madctl = self._rotations.get(rotate)
+        if madctl is not None:
+            return madctl
+        w, h = self.width, self.height
+        if rotate == 90:
+            def transform(x, y):
+                return y, w - 1 - x
+        elif rotate == 180:
+            def transform(x, y):
+                return w - 1 - x, h - 1 - y
+        else:
+            def transform(x, y):
+                return h - 1 - y, x
+        for value in self.MIRROR_ROTATE.values():
+            for x, y in ((0, 0), (1, 0), (0, 1)):
+                if self._panel_point(self.rotation, x, y) != \
+                        self._panel_point(value, *transform(x, y)):
+                    break
+            else:
+                madctl = value | (self.rotation & 0x08)
+                self._rotations[rotate] = madctl
+                return madctl
+        raise ValueError('No MADCTL frame for rotation.')
+
+    def _panel_point(self, madctl, x, y):
+        """Return the frame memory column and row of a pixel."""
+        columns = self.height if self.rotation & 0x20 else self.width
+        if madctl & 0x20:  # MV: exchange
+            x, y = y, x
+        if madctl & 0x40:  # MX: column order
+            x = columns - 1 - x
+        if madctl & 0x80:  # MY: row order
+            y = (self.width + self.height - columns) - 1 - y
+        return x, y
+
+    def _rotate_pixels(self, buf, w, h, rotate):
+        """Return a copy of w x h pixel data rotated clockwise."""
+        src = memoryview(buf)
+        out = bytearray(w * h * 2)
+        pos = 0
+        for sy in range(h):
+            for sx in range(w):
+                if rotate == 90:
+                    i = (sx * h + h - 1 - sy) * 2
+                elif rotate == 180:
+                    i = ((h - 1 - sy) * w + w - 1 - sx) * 2
+                else:
+                    i = ((w - 1 - sx) * h + sy) * 2
+                out[i:i + 2] = src[pos:pos + 2]
+                pos += 2
+        return out
+
+    def draw_sprite(self, buf, x, y, w, h, rotate=0):
         """Draw a sprite (optimized for horizontal drawing).
 
         Args:
@@ -549,15 +1060,40 @@ class Display(object):
             y (int): Starting Y position.
             w (int): Width of drawing.
             h (int): Height of drawing.
+            rotate (int): Clockwise rotation 0 (default), 90, 180 or 270.
+                A 90 or 270 degree sprite is h wide and w high.
         """
-        x2 = x + w - 1
-        y2 = y + h - 1
-        if self.is_off_grid(x, y, x2, y2):
-            return
-        self.block(x, y, x2, y2, buf)
+        if rotate:
+            self.draw_rotated(buf, x, y, w, h, rotate)
+        else:
+            self.block(x, y, x + w - 1, y + h - 1, buf)
+
+    def draw_sprite_runs(self, buf, x, y, w, h, runs):
+        """Draw only the opaque pixels of a sprite (transparent blit).
+
+        Args:
+            buf (bytearray): Sprite pixel data.
+            x (int): Starting X position.
+            y (int): Starting Y position.
+            w (int): Width of sprite.
+            h (int): Height of sprite.
+            runs (array): Opaque rectangles as x0, y0, x1, y1 sprite
+                coordinates, one row high or full width (see
+                sprite_handler.opaque_runs).
+        Note:
+            Each rectangle is one block() write, pixels outside them are
+            left as they are on the display.
+        """
+        mv = memoryview(buf)
+        stride = w * 2
+        for i in range(0, len(runs), 4):
+            x0, y0, x1, y1 = runs[i], runs[i + 1], runs[i + 2], runs[i + 3]
+            start = y0 * stride + x0 * 2
+            self.block(x + x0, y + y0, x + x1, y + y1,
+                       mv[start:start + (x1 - x0 + 1) * 2 * (y1 - y0 + 1)])
 
     def draw_text(self, x, y, text, font, color,  background=0,
-                  landscape=False, rotate_180=False, spacing=1):
+                  landscape=False, rotate_180=False, spacing=1, scale=1):
         """Draw text.
 
         Args:
@@ -570,35 +1106,146 @@ class Display(object):
             landscape (bool): Orientation (default: False = portrait)
             rotate_180 (bool): Rotate text by 180 degrees
             spacing (int): Pixels between letters (default: 1)
+            scale (int): Integer scale factor 1 (default) to 8, spacing
+                is not scaled
+        Note:
+            Letters and spacing are assembled in the second image chunk
+            buffer (see image_buffers) and sent as one block.  Text that
+            does not fit in the buffer is sent in strips of whole letters.
+            With a threaded pipeline (see enable_pipeline) strips of text
+            that is fully visible are assembled in the free band slot.
         """
-        iterable_text = reversed(text) if rotate_180 else text
-        for letter in iterable_text:
-            # Get letter array and letter dimensions
-            w, h = self.draw_letter(x, y, letter, font, color, background,
-                                    landscape, rotate_180)
-            # Stop on error
-            if w == 0 or h == 0:
-                print('Invalid width {0} or height {1}'.format(w, h))
-                return
+        # Draw the letters before a letter missing from the font (in
+        # drawing order, rotated text is drawn last letter first)
+        for i, letter in enumerate(reversed(text) if rotate_180 else text):
+            if not 0 <= ord(letter) - font.start_letter < font.letter_count:
+                print('Font does not contain character: ' + letter)
+                text = text[len(text) - i:] if rotate_180 else text[:i]
+                break
+        if not text:
+            return
+        h = font.height * scale
+        length = font.measure_text(text, 0) * scale + len(text) * spacing
+        pipeline = self.pipeline
+        if landscape:
+            x0, y0, x1, y1 = x, y - length, x + h - 1, y - 1
+        else:
+            x0, y0, x1, y1 = x, y, x + length - 1, y + h - 1
+        if pipeline is not None and pipeline.threaded and \
+                self.buffer is None and not rotate_180 and \
+                x0 >= 0 and y0 >= 0 and x1 < self.width and \
+                y1 < self.height:
+            # Assemble strips in the free slot while the worker sends
+            capacity = pipeline.size // (h * 2)
+        else:
+            pipeline = None
+            buf = self.image_buffers()[1]
+            capacity = len(buf) // (h * 2)  # Pixels along the text per strip
+        offset = 0
+        start = 0
+        while start < len(text):
+            if start == 0 and length <= capacity:
+                strip, n = text, length
+            else:
+                end = start
+                n = 0
+                while end < len(text):
+                    step = font.measure_text(text[end], 0) * scale + spacing
+                    if n + step > capacity and end > start:
+                        break
+                    n += step
+                    end += 1
+                strip = text[start:end]
+            if n > capacity:
+                data = memoryview(bytearray(n * h * 2))  # Letter too wide
+            elif pipeline is not None:
+                data = pipeline.acquire()
+            else:
+                data = buf
+            data = self._text_strip(data, strip, n, font, color, background,
+                                    landscape, rotate_180, spacing, scale)
+            # Letters are assembled unrotated, then rotated by the display
+            if pipeline is not None and n <= capacity:
+                if landscape:
+                    pipeline.submit(x, y - offset - n, x + h - 1,
+                                    y - offset - 1, len(data))
+                else:
+                    pipeline.submit(x + offset, y, x + offset + n - 1,
+                                    y + h - 1, len(data))
+            elif landscape:
+                if rotate_180:
+                    self.draw_rotated(data, x, y - length + offset, h, n, 180)
+                else:
+                    self.block(x, y - offset - n, x + h - 1, y - offset - 1,
+                               data)
+            elif rotate_180:
+                self.draw_rotated(data, x + length - offset - n, y, n, h, 180)
+            else:
+                self.block(x + offset, y, x + offset + n - 1, y + h - 1,
+                           data)
+            offset += n
+            start += len(strip)
+
+    def _text_strip(self, buf, text, n, font, color, background, landscape,
+                    spacing_first, spacing, scale):
+        """Assemble letters and spacing of a text strip in a buffer.
 
+        Args:
+            buf (memoryview): Buffer of at least n * font.height * scale
+                pixels.
+            text (string): Letters of the strip.
+            n (int): Strip length along the text (letters plus spacing).
+            font (XglcdFont object): Font.
+            color (int): RGB565 color value.
+            background (int): RGB565 background color.
+            landscape (bool): Letters read upwards in rows of font.height
+                pixels (default: left to right in rows of n pixels).
+            spacing_first (bool): Spacing precedes each letter.
+            spacing (int): Pixels between letters.
+            scale (int): Integer scale factor.
+        Returns:
+            (memoryview): Pixel data of the strip.
+        """
+        h = font.height * scale
+        pos = 0  # Pixels along the text
+        for letter in text:
+            glyph, w, _ = font.get_letter(letter, color, background,
+                                          landscape, scale)
+            if spacing_first:
+                self._text_spacing(buf, pos, n, h, spacing, background,
+                                   landscape)
+                pos += spacing
             if landscape:
-                # Fill in spacing
-                if spacing:
-                    self.fill_hrect(x, y - w - spacing, h, spacing, background)
-                # Position y for next letter
-                y -= (w + spacing)
+                # Rows of h pixels, first letter at the bottom
+                i = (n - pos - w) * h * 2
+                buf[i:i + w * h * 2] = glyph
             else:
-                # Fill in spacing
-                if spacing:
-                    self.fill_hrect(x + w, y, spacing, h, background)
-                # Position x for next letter
-                x += (w + spacing)
-
-                # # Fill in spacing
-                # if spacing:
-                #     self.fill_vrect(x + w, y, spacing, h, background)
-                # # Position x for next letter
-                # x += w + spacing
+                row_bytes = w * 2
+                i = pos * 2
+                for r in range(0, h * row_bytes, row_bytes):
+                    buf[i:i + row_bytes] = glyph[r:r + row_bytes]
+                    i += n * 2
+            pos += w
+            if not spacing_first:
+                self._text_spacing(buf, pos, n, h, spacing, background,
+                                   landscape)
+                pos += spacing
+        return buf[:n * h * 2]
+
+    def _text_spacing(self, buf, pos, n, h, spacing, background, landscape):
+        """Fill spacing at pos of a text strip (see _text_strip)."""
+        if not spacing:
+            return
+        if landscape:
+            i = (n - pos - spacing) * h * 2
+            buf[i:i + spacing * h * 2] = self.color_run(background,
+                                                        spacing * h)
+        else:
+            run = self.color_run(background, spacing)
+            i = pos * 2
+            for _ in range(h):
+                buf[i:i + spacing * 2] = run
+                i += n * 2
 
     def draw_text8x8(self, x, y, text, color,  background=0,
                      rotate=0):
@@ -611,47 +1258,44 @@ class Display(object):
             color (int): RGB565 color value.
             background (int): RGB565 background color (default: black).
             rotate(int): 0, 90, 180, 270
+        Note:
+            Text is drawn into a 1 bit frame buffer and expanded to RGB565
+            a byte at a time (see glyph_expand).  Without framebuf (e.g.
+            CPython with the emulator) the 5x8 SysFont glyphs are drawn in
+            8x8 cells instead.
         """
         w = len(text) * 8
         h = 8
-        # Confirm coordinates in boundary
-        if self.is_off_grid(x, y, x + 7, y + 7):
-            return
+        if FrameBuffer is None:
+            bits = self._text8x8_bits(text)
+        else:
+            bits = bytearray(w)  # w * h / 8
+            FrameBuffer(bits, w, h, MONO_HMSB).text(text, 0, 0, 1)
         buf = bytearray(w * 16)
-        fbuf = FrameBuffer(buf, w, h, RGB565)
-        if background != 0:
-            # Swap background color bytes to correct for framebuf endianness
-            b_color = ((background & 0xFF) << 8) | ((background & 0xFF00) >> 8)
-            fbuf.fill(b_color)
-        # Swap text color bytes to correct for framebuf endianness
-        t_color = ((color & 0xFF) << 8) | ((color & 0xFF00) >> 8)
-        fbuf.text(text, 0, 0, t_color)
+        glyph_expand.expand_rows(glyph_expand.table(color, background), bits,
+                                 w, h, buf)
         if rotate == 0:
             self.block(x, y, x + w - 1, y + (h - 1), buf)
-        elif rotate == 90:
-            buf2 = bytearray(w * 16)
-            fbuf2 = FrameBuffer(buf2, h, w, RGB565)
-            for y1 in range(h):
-                for x1 in range(w):
-                    fbuf2.pixel(y1, x1,
-                                fbuf.pixel(x1, (h - 1) - y1))
-            self.block(x, y, x + (h - 1), y + w - 1, buf2)
-        elif rotate == 180:
-            buf2 = bytearray(w * 16)
-            fbuf2 = FrameBuffer(buf2, w, h, RGB565)
-            for y1 in range(h):
-                for x1 in range(w):
-                    fbuf2.pixel(x1, y1,
-                                fbuf.pixel((w - 1) - x1, (h - 1) - y1))
-            self.block(x, y, x + w - 1, y + (h - 1), buf2)
-        elif rotate == 270:
-            buf2 = bytearray(w * 16)
-            fbuf2 = FrameBuffer(buf2, h, w, RGB565)
-            for y1 in range(h):
-                for x1 in range(w):
-                    fbuf2.pixel(y1, x1,
-                                fbuf.pixel((w - 1) - x1, y1))
-            self.block(x, y, x + (h - 1), y + w - 1, buf2)
+        elif rotate in (90, 180, 270):
+            self.draw_rotated(buf, x, y, w, h, rotate)
+
+    def _text8x8_bits(self, text):
+        """Render text as MONO_HMSB bits of 8x8 SysFont cells.
+
+        Args:
+            text (string): Text to render.
+        Returns:
+            (bytearray): len(text) bytes per row, 8 rows.
+        """
+        from modules.sys_font import SYSFONT
+        data = SYSFONT["Data"]
+        columns = bytearray(len(text) * 8)  # One byte per column
+        for i, letter in enumerate(text):
+            c = ord(letter)
+            if (c + 1) * 5 > len(data):
+                c = ord('?')
+            columns[i * 8:i * 8 + 5] = data[c * 5:c * 5 + 5]
+        return glyph_expand.columns_to_rows(columns, len(text) * 8, 8)
 
     def draw_vline(self, x, y, h, color):
         """Draw a vertical line.
@@ -662,11 +1306,58 @@ class Display(object):
             h (int): Height of line.
             color (int): RGB565 color value.
         """
-        # Confirm coordinates in boundary
-        if self.is_off_grid(x, y, x, y + h - 1):
-            return
-        line = color.to_bytes(2, 'big') * h
-        self.block(x, y, x, y + h - 1, line)
+        self._vspan(x, y, y + h - 1, color)
+
+    def enable_buffer(self, x=0, y=0, w=None, h=None, color=0):
+        """Draw into an off-screen RGB565 buffer instead of the display.
+
+        Args:
+            x (Optional int): Buffer region left (default 0).
+            y (Optional int): Buffer region top (default 0).
+            w (Optional int): Buffer region width (default: to right edge).
+            h (Optional int): Buffer region height (default: to bottom edge).
+            color (Optional int): RGB565 initial buffer color (default black).
+        Note:
+            Drawing inside the region only updates RAM and records dirty
+            rectangles.  Call flush() to send them to the display in as
+            few transactions as possible.  The whole region is marked dirty
+            initially so the first flush paints it with color.
+            A full 320x240 buffer needs 150KB, use a smaller region on
+            boards w/o PSRAM.
+        """
+        if w is None:
+            w = self.width - x
+        if h is None:
+            h = self.height - y
+        if x < 0 or y < 0 or w <= 0 or h <= 0 or \
+                x + w > self.width or y + h > self.height:
+            raise ValueError('Buffer region must be inside the display.')
+        self.buffer = None  # Release any previous buffer before allocating
+        self.buffer_mv = None
+        if color:
+            self.buffer = bytearray(color.to_bytes(2, 'big') * (w * h))
+        else:
+            self.buffer = bytearray(w * h * 2)
+        self.buffer_mv = memoryview(self.buffer)
+        self.buffer_rect = (x, y, x + w - 1, y + h - 1)
+        self.buffer_width = w
+        self.dirty = [[x, y, x + w - 1, y + h - 1]]
+
+    def enable_pipeline(self, size=4096, threaded=True):
+        """Send blocks from a worker thread while drawing continues.
+
+        Args:
+            size (Optional int): Bytes per band slot, two slots are
+                allocated (default 4096).
+            threaded (Optional bool): Use a _thread worker (default True),
+                False or a port without _thread sends blocks directly.
+        Note:
+            Rendering the next glyph, sprite or image chunk overlaps the
+            transfer of the previous one.  Commands wait for pending bands,
+            so drawing order is kept.  Do not draw from other threads.
+        """
+        self.disable_pipeline()
+        self.pipeline = BandPipeline(self._send_block, size, threaded)
 
     def fill_circle(self, x0, y0, r, color):
         """Draw a filled circle.
@@ -758,14 +1449,18 @@ class Display(object):
             h (int): Height of rectangle.
             color (int): RGB565 color value.
         """
-        if self.is_off_grid(x, y, x + w - 1, y + h - 1):
+        clipped = self.clip_rect(x, y, x + w - 1, y + h - 1)
+        if clipped is None:
             return
+        x, y, x2, y2 = clipped
+        w = x2 - x + 1
+        h = y2 - y + 1
         chunk_height = 1024 // w
         chunk_count, remainder = divmod(h, chunk_height)
         chunk_size = chunk_height * w
         chunk_y = y
         if chunk_count:
-            buf = color.to_bytes(2, 'big') * chunk_size
+            buf = self.color_run(color, chunk_size)
             for c in range(0, chunk_count):
                 self.block(x, chunk_y,
                            x + w - 1, chunk_y + chunk_height - 1,
@@ -773,7 +1468,7 @@ class Display(object):
                 chunk_y += chunk_height
 
         if remainder:
-            buf = color.to_bytes(2, 'big') * remainder * w
+            buf = self.color_run(color, remainder * w)
             self.block(x, chunk_y,
                        x + w - 1, chunk_y + remainder - 1,
                        buf)
@@ -788,8 +1483,12 @@ class Display(object):
             h (int): Height of rectangle.
             color (int): RGB565 color value.
         """
-        if self.is_off_grid(x, y, x + w - 1, y + h - 1):
+        clipped = self.clip_rect(x, y, x + w - 1, y + h - 1)
+        if clipped is None:
             return
+        x, y, x2, y2 = clipped
+        w = x2 - x + 1
+        h = y2 - y + 1
         if w > h:
             self.fill_hrect(x, y, w, h, color)
         else:
@@ -887,14 +1586,18 @@ class Display(object):
             h (int): Height of rectangle.
             color (int): RGB565 color value.
         """
-        if self.is_off_grid(x, y, x + w - 1, y + h - 1):
+        clipped = self.clip_rect(x, y, x + w - 1, y + h - 1)
+        if clipped is None:
             return
+        x, y, x2, y2 = clipped
+        w = x2 - x + 1
+        h = y2 - y + 1
         chunk_width = 1024 // h
         chunk_count, remainder = divmod(w, chunk_width)
         chunk_size = chunk_width * h
         chunk_x = x
         if chunk_count:
-            buf = color.to_bytes(2, 'big') * chunk_size
+            buf = self.color_run(color, chunk_size)
             for c in range(0, chunk_count):
                 self.block(chunk_x, y,
                            chunk_x + chunk_width - 1, y + h - 1,
@@ -902,11 +1605,86 @@ class Display(object):
                 chunk_x += chunk_width
 
         if remainder:
-            buf = color.to_bytes(2, 'big') * remainder * h
+            buf = self.color_run(color, remainder * h)
             self.block(chunk_x, y,
                        chunk_x + remainder - 1, y + h - 1,
                        buf)
 
+    def flush(self):
+        """Send the dirty areas of the off-screen buffer to the display.
+
+        Note:
+            Each dirty rectangle is one transaction.  Rectangles as wide
+            as the buffer are sent with a single data write.
+            Pending pipeline bands are sent first, also without a buffer.
+        """
+        if self.pipeline is not None:
+            self.pipeline.drain()
+        if self.buffer is None or not self.dirty:
+            return
+        bx0, by0 = self.buffer_rect[0], self.buffer_rect[1]
+        buffer_stride = self.buffer_width * 2
+        buf = self.buffer_mv
+        spi = self.spi
+        for x0, y0, x1, y1 in self.dirty:
+            row_bytes = (x1 - x0 + 1) * 2
+            pos = (y0 - by0) * buffer_stride + (x0 - bx0) * 2
+            try:
+                self.write_window(x0, y0, x1, y1)
+                if row_bytes == buffer_stride:
+                    spi.write(buf[pos:pos + row_bytes * (y1 - y0 + 1)])
+                else:
+                    for _ in range(y1 - y0 + 1):
+                        spi.write(buf[pos:pos + row_bytes])
+                        pos += buffer_stride
+            except Exception:
+                self._window = None  # Write pointer unknown
+                raise
+            finally:
+                self.write_end()
+        self.dirty = []
+
+    def idle_mode(self, enable=True):
+        """Enters or exits idle mode (8 colors, lower power).
+
+        Args:
+            enable (bool): True (default)=Enter idle mode, False=Exit idle
+        Note:
+            Only the most significant bit of each color component is
+            shown.  Display RAM keeps full colors.
+        """
+        if enable == self.idle:
+            return
+        self.write_cmd(self.IDMON if enable else self.IDMOFF)
+        self.idle = enable
+
+    def image_buffers(self):
+        """Return the two reusable chunk buffers.
+
+        Returns:
+            (memoryview, memoryview): Chunk buffers.
+        Note:
+            The first buffer streams images (draw_image, rle565,
+            AsyncDisplay), the second is scratch space for read_block,
+            draw_text and SysFont.text_sysfont_buffered.  Callers must not
+            hold either across other drawing.
+            Allocated on first use.  If image_chunk is None the chunk size
+            is 1/8 of free RAM (1024 to 8192 bytes), so both buffers use at
+            most a quarter of it.  Call release_image_buffers() to free.
+        """
+        if self._image_buffers is None:
+            size = self.image_chunk
+            if size is None:
+                try:
+                    from gc import collect, mem_free
+                    collect()
+                    size = min(max(mem_free() // 8, 1024), 8192)
+                except ImportError:
+                    size = 8192
+            self._image_buffers = (memoryview(bytearray(size)),
+                                   memoryview(bytearray(size)))
+        return self._image_buffers
+
     def invert(self, enable=True):
         """Enables or disables inversion of display colors.
 
@@ -928,20 +1706,15 @@ class Display(object):
             ymax (int): Maximum vertical pixel.
         Returns:
             boolean: False = Coordinates OK, True = Error.
+        Note:
+            Drawing methods clip instead of rejecting (see clip_rect).
+            Messages are only printed when diagnostics is enabled.
         """
-        if xmin < 0:
-            print('x-coordinate: {0} below minimum of 0.'.format(xmin))
-            return True
-        if ymin < 0:
-            print('y-coordinate: {0} below minimum of 0.'.format(ymin))
-            return True
-        if xmax >= self.width:
-            print('x-coordinate: {0} above maximum of {1}.'.format(
-                xmax, self.width - 1))
-            return True
-        if ymax >= self.height:
-            print('y-coordinate: {0} above maximum of {1}.'.format(
-                ymax, self.height - 1))
+        if xmin < 0 or ymin < 0 or \
+                xmax >= self.width or ymax >= self.height:
+            if self.diagnostics:
+                print('({0}, {1})-({2}, {3}) outside {4}x{5}.'.format(
+                    xmin, ymin, xmax, ymax, self.width, self.height))
             return True
         return False
 
@@ -954,11 +1727,170 @@ class Display(object):
             h (int): Height of image.
         Notes:
             w x h cannot exceed 2048 on boards w/o PSRAM
+            RLE compressed files (see rle565) are decoded.
         """
         buf_size = w * h * 2
         with open(path, "rb") as f:
+            if f.read(4) == rle565.MAGIC:
+                f.seek(0)
+                return rle565.decode(f.read())[0]
+            f.seek(0)
             return f.read(buf_size)
 
+    def normal_mode(self):
+        """Return to normal display mode (full screen, full colors).
+
+        Note:
+            Ends partial mode and idle mode.  clear() calls this.
+        """
+        self.write_cmd(self.NORON)
+        self.partial = None
+        self.idle_mode(False)
+
+    def partial_mode(self, start, end):
+        """Show only a band of the screen (partial mode).
+
+        Args:
+            start (int): First row of the band (first column in landscape).
+            end (int): Last row of the band (last column in landscape).
+        Note:
+            The band runs along the panel's 320 pixel axis, which is the
+            Y axis in portrait and the X axis in landscape rotations.  The
+            rest of the panel is not refreshed and shows a blank level.
+            Use set_frame_rate(hz, 'partial') to change the refresh rate of
+            the band and normal_mode() or clear() to show the whole screen.
+        """
+        length = self.width if self.rotation & 0x20 else self.height
+        start = max(0, min(start, length - 1))
+        end = max(start, min(end, length - 1))
+        if self.partial == (start, end):
+            return
+        row0, row1 = start, end
+        if self.rotation & 0x80:  # MY: panel rows run from the other end
+            row0, row1 = length - 1 - end, length - 1 - start
+        self.write_cmd(self.PTLAR, row0 >> 8, row0 & 0xFF,
+                       row1 >> 8, row1 & 0xFF)
+        if self.partial is None:
+            self.write_cmd(self.PTLON)
+        self.partial = (start, end)
+
+    def read_block(self, x0, y0, x1, y1, buf=None):
+        """Read a block of pixels back from the display.
+
+        Args:
+            x0 (int):  Starting X position.
+            y0 (int):  Starting Y position.
+            x1 (int):  Ending X position.
+            y1 (int):  Ending Y position.
+            buf (Optional bytearray): Destination for the RGB565 pixel data,
+                at least width * height * 2 bytes (default: allocated).
+        Returns:
+            (bytearray): RGB565 pixel data in block() format.
+        Note:
+            The panel sends RGB666 (3 bytes per pixel), which is converted
+            to RGB565.  Reading needs MISO connected and an SPI clock the
+            panel can read at (the ILI9341 is specified for 6.6MHz reads).
+            Blocks inside the off-screen buffer region are copied from the
+            buffer, otherwise the buffer is flushed first.
+        """
+        if x0 < 0 or y0 < 0 or x1 >= self.width or y1 >= self.height or \
+                x1 < x0 or y1 < y0:
+            raise ValueError('Block must be inside the display.')
+        row_bytes = (x1 - x0 + 1) * 2
+        size = row_bytes * (y1 - y0 + 1)
+        if buf is None:
+            buf = bytearray(size)
+        elif len(buf) < size:
+            raise ValueError('Buffer must hold {0} bytes.'.format(size))
+        dst = memoryview(buf)
+        if self.buffer is not None:
+            bx0, by0, bx1, by1 = self.buffer_rect
+            if x0 >= bx0 and y0 >= by0 and x1 <= bx1 and y1 <= by1:
+                buffer_stride = self.buffer_width * 2
+                pos = (y0 - by0) * buffer_stride + (x0 - bx0) * 2
+                src = self.buffer_mv
+                for offset in range(0, size, row_bytes):
+                    dst[offset:offset + row_bytes] = \
+                        src[pos:pos + row_bytes]
+                    pos += buffer_stride
+                return buf
+            self.flush()
+        self._read_rows(x0, y0, x1, y1, dst, False)
+        return buf
+
+    def _read_rows(self, x0, y0, x1, y1, dst, little):
+        """Read display RAM and convert it to RGB565.
+
+        Args:
+            x0, y0, x1, y1 (int): Display rectangle.
+            dst (memoryview): Destination, width * height * 2 bytes.
+            little (bool): Little endian pixels (BMP) instead of big endian.
+        """
+        w = x1 - x0 + 1
+        raw = self.image_buffers()[1]
+        rows = len(raw) // (w * 3)
+        if rows == 0:
+            raw = memoryview(bytearray(w * 3))
+            rows = 1
+        hi_pos = 1 if little else 0
+        lo_pos = 1 - hi_pos
+        pos = 0
+        while y0 <= y1:
+            rows = min(rows, y1 - y0 + 1)
+            n = rows * w * 3
+            self.read_ram(x0, y0, x1, y0 + rows - 1, raw[:n])
+            for i in range(0, n, 3):
+                # 6 bits per color, left aligned in each byte
+                g = raw[i + 1]
+                dst[pos + hi_pos] = (raw[i] & 0xF8) | (g >> 5)
+                dst[pos + lo_pos] = ((g << 3) & 0xE0) | (raw[i + 2] >> 3)
+                pos += 2
+            y0 += rows
+
+    def read_ram_mpy(self, x0, y0, x1, y1, data):
+        """Read RGB666 pixel data of a window (MicroPython).
+
+        Args:
+            x0, y0, x1, y1 (int): Display rectangle.
+            data (memoryview): Destination, 3 bytes per pixel.
+        """
+        self.write_cmd(self.SET_COLUMN, x0 >> 8, x0 & 0xff, x1 >> 8, x1 & 0xff)
+        self.write_cmd(self.SET_PAGE, y0 >> 8, y0 & 0xff, y1 >> 8, y1 & 0xff)
+        self.dc(0)
+        self.cs(0)
+        self._cmd_buf[0] = self.READ_RAM
+        self.spi.write(self._cmd_buf)
+        self.dc(1)
+        self.spi.readinto(self._cmd_buf)  # Dummy byte
+        self.spi.readinto(data)
+        self.cs(1)
+
+    def read_ram_cpy(self, x0, y0, x1, y1, data):
+        """Read RGB666 pixel data of a window (CircuitPython).
+
+        Args:
+            x0, y0, x1, y1 (int): Display rectangle.
+            data (memoryview): Destination, 3 bytes per pixel.
+        """
+        self.write_cmd(self.SET_COLUMN, x0 >> 8, x0 & 0xff, x1 >> 8, x1 & 0xff)
+        self.write_cmd(self.SET_PAGE, y0 >> 8, y0 & 0xff, y1 >> 8, y1 & 0xff)
+        # Confirm SPI locked before reading
+        while not self.spi.try_lock():
+            pass
+        self.dc.value = False
+        self.cs.value = False
+        self._cmd_buf[0] = self.READ_RAM
+        self.spi.write(self._cmd_buf)
+        self.dc.value = True
+        self.spi.readinto(self._cmd_buf)  # Dummy byte
+        self.spi.readinto(data)
+        self.cs.value = True
+        self.spi.unlock()
+
+    def release_image_buffers(self):
+        """Free the image chunk buffers (reallocated when next needed)."""
+        self._image_buffers = None
+
     def reset_cpy(self):
         """Perform reset: Low=initialization, High=normal operation.
 
@@ -979,6 +1911,86 @@ class Display(object):
         self.rst(1)
         sleep(.05)
 
+    def restore_region(self, saved):
+        """Restore pixels saved by save_region().
+
+        Args:
+            saved (tuple): Value returned by save_region().
+        """
+        if saved is None:
+            return
+        x0, y0, x1, y1, data = saved
+        self.block(x0, y0, x1, y1, data)
+
+    def save_region(self, x, y, w, h):
+        """Save the pixels of a screen region (e.g. under a popup).
+
+        Args:
+            x (int): Region left.
+            y (int): Region top.
+            w (int): Width of region.
+            h (int): Height of region.
+        Returns:
+            (tuple): Saved region for restore_region() or None if the
+            region is off screen.  Uses w * h * 2 bytes of RAM.
+        """
+        visible = self.clip_rect(x, y, x + w - 1, y + h - 1)
+        if visible is None:
+            return None
+        x0, y0, x1, y1 = visible
+        return x0, y0, x1, y1, self.read_block(x0, y0, x1, y1)
+
+    def screenshot(self, path, bmp=True, x=0, y=0, w=None, h=None):
+        """Save the screen (or a region of it) to a file.
+
+        Args:
+            path (string): File path.
+            bmp (bool): True (default)=BMP file, False=raw RGB565 that
+                draw_image() can load.
+            x (Optional int): Region left (default 0).
+            y (Optional int): Region top (default 0).
+            w (Optional int): Region width (default: to right edge).
+            h (Optional int): Region height (default: to bottom edge).
+        Note:
+            Rows are read and written in chunks through the image chunk
+            buffers, the screen is never held in RAM.  BMP files are 16 bit
+            top-down bitmaps with 5-6-5 bit fields.
+        """
+        if w is None:
+            w = self.width - x
+        if h is None:
+            h = self.height - y
+        if x < 0 or y < 0 or w <= 0 or h <= 0 or \
+                x + w > self.width or y + h > self.height:
+            raise ValueError('Region must be inside the display.')
+        self.flush()
+        row_bytes = w * 2
+        pad = (-row_bytes) % 4 if bmp else 0  # BMP rows are 4 byte aligned
+        out = self.image_buffers()[0]
+        chunk_height = len(out) // row_bytes
+        if chunk_height == 0:
+            out = memoryview(bytearray(row_bytes))
+            chunk_height = 1
+        with open(path, 'wb') as f:
+            if bmp:
+                image_size = (row_bytes + pad) * h
+                f.write(pack('<2sIHHI', b'BM', 66 + image_size, 0, 0, 66))
+                # BITMAPINFOHEADER, negative height = top-down rows
+                f.write(pack('<IiiHHIIiiII', 40, w, -h, 1, 16, 3,
+                             image_size, 2835, 2835, 0, 0))
+                f.write(pack('<III', 0xF800, 0x07E0, 0x001F))
+            y1 = y + h - 1
+            while y <= y1:
+                rows = min(chunk_height, y1 - y + 1)
+                self._read_rows(x, y, x + w - 1, y + rows - 1, out, bmp)
+                if pad:
+                    for pos in range(0, rows * row_bytes, row_bytes):
+                        f.write(out[pos:pos + row_bytes])
+                        f.write(b'\x00' * pad)
+                else:
+                    f.write(out[:rows * row_bytes])
+                y += rows
+
     def scroll(self, y):
         """Scroll display vertically.
 
@@ -987,6 +1999,31 @@ class Display(object):
         """
         self.write_cmd(self.VSCRSADD, y >> 8, y & 0xFF)
 
+    def set_frame_rate(self, hz, mode='normal'):
+        """Set the panel refresh rate of a display mode.
+
+        Args:
+            hz (float): Frame rate, about 8 to 119 Hz.
+            mode (string): 'normal' (default), 'idle' or 'partial'.
+        Returns:
+            (float): Frame rate set (closest available).
+        Note:
+            Frame rate = 615 kHz / (division ratio * clocks per line * 324)
+            with a division ratio of 1, 2, 4 or 8 and 16 to 31 clocks per
+            line.  Lower rates use less power, higher rates update faster.
+        """
+        if mode not in self.FRAME_RATE_MODES:
+            raise ValueError("Mode must be 'normal', 'idle' or 'partial'.")
+        best = None
+        for diva in range(4):
+            for rtna in range(16, 32):
+                rate = 615000 / ((1 << diva) * rtna * 324)
+                if best is None or abs(rate - hz) < abs(best[0] - hz):
+                    best = (rate, diva, rtna)
+        rate, diva, rtna = best
+        self.write_cmd(self.FRAME_RATE_MODES[mode], diva, rtna)
+        return rate
+
     def set_scroll(self, top, bottom):
         """Set the height of the top and bottom scroll margins.
 
@@ -1022,13 +2059,17 @@ class Display(object):
             command (byte): ILI9341 command code.
             *args (optional bytes): Data to transmit.
         """
+        if self.pipeline is not None:
+            self.pipeline.drain()  # Keep commands in drawing order
+        self._window = None  # Any command ends the cached memory write
         self.dc(0)
         self.cs(0)
-        self.spi.write(bytearray([command]))
+        self._cmd_buf[0] = command
+        self.spi.write(self._cmd_buf)
         self.cs(1)
         # Handle any passed data
         if len(args) > 0:
-            self.write_data(bytearray(args))
+            self.write_data(self._args(args))
 
     def write_cmd_cpy(self, command, *args):
         """Write command to OLED (CircuitPython).
@@ -1037,17 +2078,37 @@ class Display(object):
             command (byte): ILI9341 command code.
             *args (optional bytes): Data to transmit.
         """
+        if self.pipeline is not None:
+            self.pipeline.drain()  # Keep commands in drawing order
+        self._window = None  # Any command ends the cached memory write
         self.dc.value = False
         self.cs.value = False
         # Confirm SPI locked before writing
         while not self.spi.try_lock():
             pass
-        self.spi.write(bytearray([command]))
+        self._cmd_buf[0] = command
+        self.spi.write(self._cmd_buf)
         self.spi.unlock()
         self.cs.value = True
         # Handle any passed data
         if len(args) > 0:
-            self.write_data(bytearray(args))
+            self.write_data(self._args(args))
+
+    def _args(self, args):
+        """Return command parameters as bytes, in the reused buffer.
+
+        Args:
+            args (tuple): Parameter bytes.
+        Returns:
+            (memoryview): Parameters (a new bytearray past 16 bytes).
+        """
+        n = len(args)
+        if n > len(self._args_buf):
+            return bytearray(args)
+        buf = self._args_buf
+        for i in range(n):
+            buf[i] = args[i]
+        return self._args_mv[:n]
 
     def write_data_mpy(self, data):
         """Write data to OLED (MicroPython).
@@ -1074,3 +2135,149 @@ class Display(object):
         self.spi.write(data)
         self.spi.unlock()
         self.cs.value = True
+
+    def write_end_mpy(self):
+        """End a transaction started by write_window_mpy (MicroPython)."""
+        self.cs(1)
+
+    def write_end_cpy(self):
+        """End a transaction started by write_window_cpy (CircuitPython)."""
+        self.cs.value = True
+        self.spi.unlock()
+
+    def _window_mode(self, x0, y0, x1, y1):
+        """Work out which window commands a memory write needs.
+
+        Args:
+            x0, y0, x1, y1 (int): Address window of the write.
+        Returns:
+            int: Bit 0 set = send SET_COLUMN, bit 1 set = send SET_PAGE.
+                 0 = no window commands, continue after the previous write.
+        Note:
+            The page range is always programmed to the bottom of the
+            display, so a write of whole rows leaves the pointer at the
+            start of the next row.  A following write with the same
+            columns that starts on that row can use WRITE_RAM_CONTINUE.
+            Parameter buffers are only loaded for commands to be sent.
+        """
+        window = self._window
+        self._window = [x0, x1, y1 + 1, y0]
+        if not self.cache_window or window is None:
+            mode = 3
+        elif window[0] == x0 and window[1] == x1:
+            if window[2] == y0:
+                self.window_elided += 2
+                self._window[3] = window[3]  # Page range unchanged
+                return 0
+            mode = 2
+        elif window[3] == y0:
+            mode = 1
+        else:
+            mode = 3
+        if mode & 1:
+            column = self._column_buf
+            column[0] = x0 >> 8
+            column[1] = x0 & 0xff
+            column[2] = x1 >> 8
+            column[3] = x1 & 0xff
+            self.window_commands += 1
+        else:
+            self.window_elided += 1
+        if mode & 2:
+            page_end = self.height - 1
+            page = self._page_buf
+            page[0] = y0 >> 8
+            page[1] = y0 & 0xff
+            page[2] = page_end >> 8
+            page[3] = page_end & 0xff
+            self.window_commands += 1
+        else:
+            self.window_elided += 1
+        return mode
+
+    def window_stats(self, reset=False):
+        """Return address window command counters.
+
+        Args:
+            reset (Optional bool): Zero the counters after reading.
+        Returns:
+            dict: Window commands sent and elided by the window cache.
+        """
+        stats = {'sent': self.window_commands, 'elided': self.window_elided}
+        if reset:
+            self.window_commands = 0
+            self.window_elided = 0
+        return stats
+
+    def write_window_mpy(self, x0, y0, x1, y1):
+        """Set address window and start a memory write (MicroPython).
+
+        Args:
+            x0 (int):  Starting X position.
+            y0 (int):  Starting Y position.
+            x1 (int):  Ending X position.
+            y1 (int):  Ending Y position.
+        Note:
+            SET_COLUMN, SET_PAGE and WRITE_RAM are sent in one transaction
+            from preallocated buffers, skipping window commands that the
+            window cache shows are redundant.  CS is left low and DC high
+            so pixel data can follow with spi.write().  The caller must
+            write the whole window, then finish with write_end().
+        """
+        mode = self._window_mode(x0, y0, x1, y1)
+        spi = self.spi
+        dc = self.dc
+        cmd = self._cmd_buf
+        self.cs(0)
+        if mode & 1:
+            dc(0)
+            cmd[0] = self.SET_COLUMN
+            spi.write(cmd)
+            dc(1)
+            spi.write(self._column_buf)
+        if mode & 2:
+            dc(0)
+            cmd[0] = self.SET_PAGE
+            spi.write(cmd)
+            dc(1)
+            spi.write(self._page_buf)
+        cmd[0] = self.WRITE_RAM if mode else self.WRITE_RAM_CONTINUE
+        dc(0)
+        spi.write(cmd)
+        dc(1)
+
+    def write_window_cpy(self, x0, y0, x1, y1):
+        """Set address window and start a memory write (CircuitPython).
+
+        Args:
+            x0 (int):  Starting X position.
+            y0 (int):  Starting Y position.
+            x1 (int):  Ending X position.
+            y1 (int):  Ending Y position.
+        Note:
+            The SPI lock is held and CS kept low until write_end().
+        """
+        mode = self._window_mode(x0, y0, x1, y1)
+        spi = self.spi
+        dc = self.dc
+        cmd = self._cmd_buf
+        # Confirm SPI locked before writing
+        while not spi.try_lock():
+            pass
+        self.cs.value = False
+        if mode & 1:
+            dc.value = False
+            cmd[0] = self.SET_COLUMN
+            spi.write(cmd)
+            dc.value = True
+            spi.write(self._column_buf)
+        if mode & 2:
+            dc.value = False
+            cmd[0] = self.SET_PAGE
+            spi.write(cmd)
+            dc.value = True
+            spi.write(self._page_buf)
+        cmd[0] = self.WRITE_RAM if mode else self.WRITE_RAM_CONTINUE
+        dc.value = False
+        spi.write(cmd)
+        dc.value = True
@@ -0,0 +1,90 @@
+"""LRU cache with a memory budget."""
+from collections import OrderedDict
+
+
+class LruCache(object):
+    """Least recently used cache limited by the total size of its values.
+
+    Attributes:
+        budget: Maximum total size of cached values in bytes
+        size: Current total size of cached values in bytes
+        hits: Number of get() calls that found the key
+        misses: Number of get() calls that did not find the key
+        evictions: Number of values dropped to stay within budget
+
+    Note:
+        Cached values are shared, callers must not modify them.
+    """
+
+    def __init__(self, budget):
+        """Constructor for LRU cache.
+
+        Args:
+            budget (int): Maximum total size in bytes (0 disables caching).
+        """
+        self.budget = budget
+        self.entries = OrderedDict()  # key: (value, size), oldest first
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def clear(self):
+        """Remove all cached values (statistics are kept)."""
+        self.entries = OrderedDict()
+        self.size = 0
+
+    def get(self, key):
+        """Return cached value and mark it most recently used.
+
+        Args:
+            key: Cache key.
+        Returns:
+            Cached value or None if not cached.
+        """
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries[key] = entry  # Reinsert as most recently used
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key, value, size=None):
+        """Cache a value, evicting least recently used values as needed.
+
+        Args:
+            key: Cache key.
+            value: Value to cache.
+            size (Optional int): Size in bytes (default: len(value)).
+        Returns:
+            The value (values larger than the budget are not cached).
+        """
+        if size is None:
+            size = len(value)
+        if size > self.budget:
+            return value
+        entries = self.entries
+        old = entries.pop(key, None)
+        if old is not None:
+            self.size -= old[1]
+        while self.size + size > self.budget:
+            oldest = next(iter(entries))
+            self.size -= entries.pop(oldest)[1]
+            self.evictions += 1
+        entries[key] = (value, size)
+        self.size += size
+        return value
+
+    def stats(self):
+        """Return cache statistics.
+
+        Returns:
+            dict: Entries, size, budget, hits, misses and evictions.
+        """
+        return {'entries': len(self.entries), 'size': self.size,
+                'budget': self.budget, 'hits': self.hits,
+                'misses': self.misses, 'evictions': self.evictions}
@@ -0,0 +1,151 @@
+"""Two-buffer render/transmit pipeline for display blocks."""
+try:
+    import _thread
+except ImportError:
+    _thread = None
+
+
+class BandPipeline(object):
+    """Overlap rendering of one band with transmission of the previous one.
+
+    Two slot buffers form a ring: while a worker thread sends one slot to
+    the display the caller fills the other.  Without _thread (or with
+    threaded=False) bands are sent immediately by the caller.
+
+    Note:
+        The overlap only helps where SPI transfers run while the caller
+        keeps computing (DMA or a port that releases the GIL during
+        transfers, e.g. the second core of an ESP32).
+    """
+
+    def __init__(self, send, size=4096, threaded=True):
+        """Constructor for BandPipeline.
+
+        Args:
+            send (function): send(x0, y0, x1, y1, data, offset, stride)
+                writes a block to the display.
+            size (int): Bytes per slot buffer (default 4096).
+            threaded (bool): Use a worker thread if _thread is available.
+        """
+        self.send = send
+        self.size = size
+        self.slots = (memoryview(bytearray(size)), memoryview(bytearray(size)))
+        self.index = 0  # Slot handed out by acquire()
+        self.item = None  # Block waiting for the worker
+        self.error = None  # Exception raised by the worker
+        self.bands = 0  # Bands sent through the slots
+        self.threaded = threaded and _thread is not None
+        if self.threaded:
+            self._work = _thread.allocate_lock()  # Released: item queued
+            self._work.acquire()
+            self._idle = _thread.allocate_lock()  # Held: item outstanding
+            self.running = True
+            _thread.start_new_thread(self._worker, ())
+
+    def acquire(self):
+        """Return the slot buffer that is free to fill.
+
+        Returns:
+            (memoryview): Slot buffer of size bytes.
+        """
+        return self.slots[self.index]
+
+    def submit(self, x0, y0, x1, y1, nbytes):
+        """Queue the filled slot for transmission and switch slots.
+
+        Args:
+            x0, y0, x1, y1 (int): Display rectangle (inside the display).
+            nbytes (int): Bytes of pixel data in the slot.
+        Note:
+            Waits until the previous band has been sent, so the slot that
+            acquire() returns next is never in flight.  An exception raised
+            by the worker for the previous band is raised here.
+        """
+        data = self.slots[self.index][:nbytes]
+        self.index ^= 1
+        self.bands += 1
+        if not self.threaded:
+            self.send(x0, y0, x1, y1, data, 0, (x1 - x0 + 1) * 2)
+            return
+        self._idle.acquire()
+        if self.error is not None:
+            # Leave the pipeline idle so later drain() calls return
+            self._idle.release()
+            self._raise()
+        self.item = (x0, y0, x1, y1, data, 0, (x1 - x0 + 1) * 2)
+        self._work.release()
+
+    def block(self, x0, y0, x1, y1, data, offset, stride):
+        """Send a block through the slots.
+
+        Args:
+            x0, y0, x1, y1 (int): Display rectangle (inside the display).
+            data (bytes): Source pixel data.
+            offset (int): Byte offset of the first source pixel.
+            stride (int): Bytes per source row.
+        Note:
+            Data is copied into the slots, so callers may reuse it as soon
+            as block() returns.  Blocks are sent directly when there is no
+            worker.
+        """
+        row_bytes = (x1 - x0 + 1) * 2
+        rows_per_slot = self.size // row_bytes
+        if not self.threaded or rows_per_slot == 0:
+            self.drain()
+            self.send(x0, y0, x1, y1, data, offset, stride)
+            return
+        src = memoryview(data)
+        end = len(data)
+        while y0 <= y1 and offset < end:
+            rows = min(rows_per_slot, y1 - y0 + 1)
+            slot = self.acquire()
+            if stride == row_bytes:
+                n = min(rows * row_bytes, end - offset)
+                slot[:n] = src[offset:offset + n]
+                offset += n
+            else:
+                n = 0
+                for _ in range(rows):
+                    slot[n:n + row_bytes] = src[offset:offset + row_bytes]
+                    n += row_bytes
+                    offset += stride
+            self.submit(x0, y0, x1, y0 + rows - 1, n)
+            y0 += rows
+
+    def drain(self):
+        """Wait until every submitted band has been sent."""
+        if self.threaded:
+            self._idle.acquire()
+            self._idle.release()
+            self._raise()
+
+    def close(self):
+        """Drain and stop the worker thread."""
+        if self.threaded:
+            self.drain()
+            self._idle.acquire()
+            self.running = False
+            self._work.release()
+            self.threaded = False
+
+    def _raise(self):
+        """Re-raise an exception from the worker in the caller."""
+        error = self.error
+        if error is not None:
+            self.error = None
+            raise error
+
+    def _worker(self):
+        """Worker thread: send queued bands until closed."""
+        while True:
+            self._work.acquire()
+            if not self.running:
+                self._idle.release()
+                return
+            item = self.item
+            self.item = None
+            try:
+                self.send(*item)
+            except Exception as e:
+                self.error = e
+            self._idle.release()
@@ -0,0 +1,237 @@
+"""RLE compressed RGB565 images.
+
+File format (all values little endian):
+    Header: b'R565', width (uint16), height (uint16)
+    Packets until the end of the file, pixels in row order:
+        0x80 | (n - 1), color (2 bytes big endian): n pixels of one color
+        (n - 1), n * 2 bytes of RGB565 pixel data: n literal pixels
+    n is 1 to 128.  Packets may span rows.
+
+Convert existing .raw files on the host with:
+    python3 rle565.py image.raw width [image.rle]
+"""
+from struct import pack, unpack
+
+MAGIC = b'R565'
+HEADER_SIZE = 8
+MAX_PACKET = 128
+
+
+def read_header(f):
+    """Read and check the image header.
+
+    Args:
+        f (file): Image file positioned at the start.
+    Returns:
+        (int, int): Image width and height.
+    """
+    header = f.read(HEADER_SIZE)
+    if len(header) < HEADER_SIZE or header[:4] != MAGIC:
+        raise ValueError('Not an RLE565 image.')
+    return unpack('<HH', header[4:])
+
+
+def packets(f):
+    """Decode packets from an image file.
+
+    Args:
+        f (file): Image file positioned after the header.
+    Yields:
+        (int, int, memoryview): Pixel count, run color (None for literal
+        packets) and literal pixel data (None for runs).
+    Note:
+        Literal data is a reused buffer, it is only valid until the
+        next packet is read.
+    """
+    control = bytearray(1)
+    color = bytearray(2)
+    literal = memoryview(bytearray(MAX_PACKET * 2))
+    while f.readinto(control):
+        c = control[0]
+        if c & 0x80:
+            f.readinto(color)
+            yield (c & 0x7f) + 1, (color[0] << 8) | color[1], None
+        else:
+            n = (c + 1) * 2
+            f.readinto(literal[:n])
+            yield c + 1, None, literal[:n]
+
+
+def decode(data):
+    """Decode an RLE image held in memory.
+
+    Args:
+        data (bytes): RLE image including the header.
+    Returns:
+        (bytearray, int, int): RGB565 pixel data, width and height.
+    """
+    if data[:4] != MAGIC:
+        raise ValueError('Not an RLE565 image.')
+    width, height = unpack('<HH', data[4:HEADER_SIZE])
+    pixels = bytearray(width * height * 2)
+    src = memoryview(data)
+    pos = HEADER_SIZE
+    out = 0
+    end = len(data)
+    while pos < end:
+        c = data[pos]
+        if c & 0x80:
+            n = ((c & 0x7f) + 1) * 2
+            pixels[out:out + n] = data[pos + 1:pos + 3] * (n // 2)
+            pos += 3
+        else:
+            n = (c + 1) * 2
+            pixels[out:out + n] = src[pos + 1:pos + 1 + n]
+            pos += 1 + n
+        out += n
+    return pixels, width, height
+
+
+def encode(raw, width, height=None):
+    """Encode RGB565 pixel data.
+
+    Args:
+        raw (bytes): RGB565 pixel data (2 bytes per pixel, row order).
+        width (int): Image width.
+        height (Optional int): Image height (default: from data length).
+    Returns:
+        (bytearray): RLE image including the header.
+    """
+    count = len(raw) // 2
+    if height is None:
+        height = count // width
+    count = min(count, width * height)
+    out = bytearray(MAGIC + pack('<HH', width, height))
+    literal_start = 0
+    i = 0
+    while i < count:
+        # Length of the run of identical pixels starting at i
+        pixel = raw[i * 2:i * 2 + 2]
+        j = i + 1
+        while j < count and j - i < MAX_PACKET and \
+                raw[j * 2:j * 2 + 2] == pixel:
+            j += 1
+        if j - i >= 2:
+            _literals(out, raw, literal_start, i)
+            out.append(0x80 | (j - i - 1))
+            out += pixel
+            literal_start = j
+        i = j
+    _literals(out, raw, literal_start, count)
+    return out
+
+
+def _literals(out, raw, start, end):
+    """Append literal packets for pixels start to end - 1."""
+    while start < end:
+        n = min(end - start, MAX_PACKET)
+        out.append(n - 1)
+        out += raw[start * 2:(start + n) * 2]
+        start += n
+
+
+def load(path):
+    """Load and decode an RLE image file.
+
+    Args:
+        path (string): Image file path.
+    Returns:
+        (bytearray, int, int): RGB565 pixel data, width and height.
+    """
+    with open(path, 'rb') as f:
+        return decode(f.read())
+
+
+def draw(display, path, x=0, y=0):
+    """Stream an RLE image file to a display.
+
+    Args:
+        display (Display): Display to draw on.
+        path (string): Image file path.
+        x (int): X coordinate of image left.  Default is 0.
+        y (int): Y coordinate of image top.  Default is 0.
+    Returns:
+        (int, int): Image width and height.
+    Note:
+        Decoded rows are collected in the display's image chunk buffer
+        and sent with one block() per band.  Runs that cover whole rows
+        are sent as fills without being expanded into the band.
+    """
+    with open(path, 'rb') as f:
+        width, height = read_header(f)
+        row_bytes = width * 2
+        band = display.image_buffers()[0]
+        band_rows = len(band) // row_bytes
+        if band_rows == 0:
+            band = memoryview(bytearray(row_bytes))
+            band_rows = 1
+        band = band[:band_rows * row_bytes]
+        band_size = len(band)
+        x2 = x + width - 1
+        row = 0  # Image row at the start of the band
+        pos = 0  # Bytes used in the band
+
+        def flush():
+            nonlocal row, pos
+            rows = pos // row_bytes
+            if rows:
+                display.block(x, y + row, x2, y + row + rows - 1,
+                              band[:rows * row_bytes])
+            rest = pos - rows * row_bytes
+            if rest:
+                band[:rest] = band[rows * row_bytes:pos]
+            row += rows
+            pos = rest
+
+        def put(data):
+            nonlocal pos
+            src = 0
+            end = len(data)
+            while src < end:
+                n = min(end - src, band_size - pos)
+                band[pos:pos + n] = data[src:src + n]
+                pos += n
+                src += n
+                if pos == band_size:
+                    flush()
+
+        for count, color, data in packets(f):
+            if color is None:
+                put(data)
+                continue
+            # Finish the current row
+            col = (pos % row_bytes) // 2
+            if col:
+                n = min(count, width - col)
+                put(display.color_run(color, n))
+                count -= n
+            rows = count // width
+            if rows:
+                flush()  # Band only holds whole rows here
+                display.fill_rectangle(x, y + row, width, rows, color)
+                row += rows
+                count -= rows * width
+            if count:
+                put(display.color_run(color, count))
+        if pos:
+            rows = (pos + row_bytes - 1) // row_bytes
+            display.block(x, y + row, x2, y + row + rows - 1, band[:pos])
+    return width, height
+
+
+if __name__ == '__main__':
+    import sys
+    if len(sys.argv) < 3:
+        print('usage: rle565.py image.raw width [image.rle]')
+        sys.exit(1)
+    raw_path = sys.argv[1]
+    raw_width = int(sys.argv[2])
+    rle_path = sys.argv[3] if len(sys.argv) > 3 else \
+        raw_path.rsplit('.', 1)[0] + '.rle'
+    with open(raw_path, 'rb') as raw_file:
+        raw_data = raw_file.read()
+    rle_data = encode(raw_data, raw_width)
+    with open(rle_path, 'wb') as rle_file:
+        rle_file.write(rle_data)
+    print('{0}: {1} -> {2} bytes'.format(rle_path, len(raw_data),
+                                        len(rle_data)))
@@ -0,0 +1,178 @@
+"""Text console using the ILI9341 hardware vertical scroll."""
+
+
+class ScrollConsole(object):
+    """Scrolling text console with fixed header and footer areas.
+
+    New lines are drawn over the oldest line and the hardware scroll
+    pointer is moved, so appending a line costs one line of pixels
+    instead of redrawing the console.
+
+    Note:
+        Hardware scrolling moves along the 320 pixel panel axis, so the
+        display must use a portrait rotation (0 or 180).
+    """
+
+    def __init__(self, display, header=0, footer=0, font=None,
+                 color=0xFFFF, background=0, line_spacing=0, spacing=1):
+        """Constructor for ScrollConsole.
+
+        Args:
+            display (Display): Portrait mode display.
+            header (int): Height of the fixed top area in pixels.
+            footer (int): Height of the fixed bottom area in pixels.
+            font (XglcdFont object): Font (default: built-in 8x8 font).
+            color (int): RGB565 text color (default: white).
+            background (int): RGB565 background color (default: black).
+            line_spacing (int): Pixels between lines (default: 0).
+            spacing (int): Pixels between letters of font (default: 1).
+        Note:
+            Rows left over when the scroll area is not a multiple of the
+            line height are added to the footer.
+        """
+        if display.rotation & 0x20:
+            raise ValueError('ScrollConsole requires a portrait rotation.')
+        self.display = display
+        self.font = font
+        self.color = color
+        self.background = background
+        self.spacing = spacing
+        char_height = 8 if font is None else font.height
+        self.line_height = char_height + line_spacing
+        self.lines = (display.height - header - footer) // self.line_height
+        if self.lines < 1:
+            raise ValueError('No room for console lines.')
+        self.header = header
+        self.area = self.lines * self.line_height  # Scroll area height
+        self.footer = display.height - header - self.area
+        # MY (row address order) flips the frame memory top and bottom
+        self.flipped = bool(display.rotation & 0x80)
+        self.count = 0  # Lines written since clear (up to self.lines)
+        self.offset = 0  # Scroll offset in pixels
+        self.clear()
+
+    def clear(self):
+        """Clear the scroll area and reset the scroll pointer."""
+        self.count = 0
+        self.offset = 0
+        if self.flipped:
+            self.display.set_scroll(self.footer, self.header)
+        else:
+            self.display.set_scroll(self.header, self.footer)
+        self._scroll()
+        self.display.fill_rectangle(0, self.header, self.display.width,
+                                    self.area, self.background)
+
+    def release(self):
+        """Restore an unscrolled full screen scroll area.
+
+        Note:
+            Scrolled lines are not moved back, redraw the screen after.
+        """
+        self.display.set_scroll(0, 0)
+        self.display.scroll(0)
+
+    def set_header(self, text, color=None, background=None):
+        """Draw text in the fixed header area.
+
+        Args:
+            text (string): Text to draw.
+            color (Optional int): RGB565 text color (default: console).
+            background (Optional int): RGB565 background (default: console).
+        """
+        self._draw_fixed(0, self.header, text, color, background)
+
+    def set_footer(self, text, color=None, background=None):
+        """Draw text in the fixed footer area.
+
+        Args:
+            text (string): Text to draw.
+            color (Optional int): RGB565 text color (default: console).
+            background (Optional int): RGB565 background (default: console).
+        """
+        self._draw_fixed(self.display.height - self.footer, self.footer,
+                         text, color, background)
+
+    def write(self, text, color=None, background=None):
+        """Append text, one console line per line of text.
+
+        Args:
+            text (string): Text, newlines start new lines and long lines
+                are wrapped.
+            color (Optional int): RGB565 text color (default: console).
+            background (Optional int): RGB565 background (default: console).
+        """
+        for line in str(text).split('\n'):
+            while True:
+                fit = self._fit(line)
+                self._append(line[:fit], color, background)
+                line = line[fit:]
+                if not line:
+                    break
+
+    def _append(self, line, color, background):
+        """Draw a line in the next slot and scroll it into view."""
+        if self.count < self.lines:
+            row = self.count * self.line_height
+            self.count += 1
+            scroll = False
+        else:
+            row = self.offset  # Oldest line, at the top of the console
+            self.offset = (self.offset + self.line_height) % self.area
+            scroll = True
+        self._draw_line(self.header + row, self.line_height, line,
+                        color, background)
+        if scroll:
+            self._scroll()
+
+    def _draw_fixed(self, y, h, text, color, background):
+        """Draw text in a fixed area, clearing the rest of it."""
+        if h <= 0:
+            return
+        self._draw_line(y, h, text[:self._fit(text)], color, background)
+
+    def _draw_line(self, y, h, text, color, background):
+        """Draw one line of text at y and fill the rest of h rows."""
+        display = self.display
+        if color is None:
+            color = self.color
+        if background is None:
+            background = self.background
+        w = 0
+        text_height = 0
+        if text:
+            if self.font is None:
+                text_height = min(8, h)
+                display.draw_text8x8(0, y, text, color, background)
+                w = len(text) * 8
+            else:
+                text_height = min(self.font.height, h)
+                display.draw_text(0, y, text, self.font, color, background,
+                                  spacing=self.spacing)
+                w = self.font.measure_text(text, self.spacing)
+        if w < display.width and text_height:
+            display.fill_rectangle(w, y, display.width - w, text_height,
+                                   background)
+        if text_height < h:
+            display.fill_rectangle(0, y + text_height, display.width,
+                                   h - text_height, background)
+
+    def _fit(self, text):
+        """Return the number of characters of text that fit on a line."""
+        width = self.display.width
+        if self.font is None:
+            return max(1, min(len(text), width // 8))
+        fit = len(text)
+        while fit > 1 and self.font.measure_text(text[:fit],
+                                                 self.spacing) > width:
+            fit -= 1
+        return fit
+
+    def _scroll(self):
+        """Program the scroll start address for the current offset."""
+        if self.flipped:
+            # Frame memory runs bottom to top, scroll the other way
+            start = self.footer + (self.area - self.offset) % self.area
+        else:
+            start = self.header + self.offset
+        self.display.scroll(start)
@@ -27,7 +27,13 @@
 #
 # Notes:
 #   o Images must contain only pixel data in RGB565 (16bit) format,
-#     no extra information
+#     no extra information, or be RLE compressed (see rle565.py)
+#   o Or palette indexed, 1/2/4/8 bits per pixel, first pixel in the
+#     high bits, sheet rows padded to whole bytes (see index_raw_image)
+#     Pixels are expanded to RGB565 through the palette when extracted,
+#     set_palette () recolors the sheet
+#   o Transparent sprites: get_index_sprite_runs () returns the image and
+#     its opaque runs for a key color, draw with display.draw_sprite_runs
 #   o All images must be the same size
 #   o Images are accessed via an index
 #
@@ -46,8 +52,85 @@ for img_idx in range (0,11) :
     display.draw_sprite (raw_image[img_idx], x=5 + (img_idx * 42), y=10,w=40,h=75)
 for img_idx in range (0,11) :
     display.draw_sprite (raw_image[img_idx+11], x=5 + (img_idx * 42), y=90,w=40,h=75)
+
+# Indexed sheet (4 bits per pixel, 1/4 of the RAM):
+#   indexed, palette = index_raw_image (rgb565_sheet, bits_per_pixel = 4 ,
+#                                       width = 240)
+#   raw_image.load_raw_sprite (indexed, 40, 75, 4, buffer_width = 240 ,
+#                              palette = palette)
+#   raw_image.set_palette ([BLACK, RED, ...]) # recolor
 '''
 
+from array import array
+from modules import rle565
+
+## index_raw_image - convert RGB565 sheet data to palette indexed data
+#   Returns (indexed bytes, palette)
+def index_raw_image (raw_image ,
+                    bits_per_pixel = 4 ,
+                    palette = None ,
+                    width = None) :
+    if palette is None :
+        palette = []
+    palette = list (palette)
+    color_index = {}
+    for idx, color in enumerate (palette) :
+        color_index [color] = idx
+    pixel_count = len (raw_image) // 2
+    if width is None :
+        width = pixel_count                 # no row padding
+    row_bytes = (width * bits_per_pixel + 7) // 8
+    indexed = bytearray (row_bytes * ((pixel_count + width - 1) // width))
+    for pixel in range (0, pixel_count) :
+        color = (raw_image [pixel * 2] << 8) | raw_image [pixel * 2 + 1]
+        idx = color_index.get (color)
+        if idx is None :
+            idx = len (palette)
+            if idx >= (1 << bits_per_pixel) :
+                raise ValueError ("index_raw_image: too many colors")
+            palette.append (color)
+            color_index [color] = idx
+        row, column = divmod (pixel, width)
+        bit = column * bits_per_pixel
+        shift = 8 - bits_per_pixel - (bit % 8)
+        indexed [row * row_bytes + bit // 8] |= idx << shift
+    return bytes (indexed), palette
+
+## opaque_runs - rectangles of a sprite image that are not key_color
+#   Returns array of x0, y0, x1, y1 (inclusive) per rectangle, horizontal
+#   runs one row high, consecutive fully opaque rows merged
+def opaque_runs (sprite_image ,
+                width ,
+                height ,
+                key_color) :
+    key_high = key_color >> 8
+    key_low = key_color & 0xff
+    runs = array ("H")
+    full_rows = None                    # start index of a full width run
+    offset = 0
+    for y_pos in range (0, height) :
+        row_runs = []
+        run_start = None
+        for x_pos in range (0, width) :
+            opaque = sprite_image [offset] != key_high \
+                    or sprite_image [offset + 1] != key_low
+            offset += 2
+            if opaque and run_start is None :
+                run_start = x_pos
+            elif not opaque and run_start is not None :
+                row_runs.append ((run_start, x_pos - 1))
+                run_start = None
+        if run_start is not None :
+            row_runs.append ((run_start, width - 1))
+        if row_runs == [(0, width - 1)] :
+            if full_rows is not None and runs [full_rows + 3] == y_pos - 1 :
+                runs [full_rows + 3] = y_pos    # extend the full rows block
+                continue
+            full_rows = len (runs)
+        for run_start, run_end in row_runs :
+            runs.extend ((run_start, y_pos, run_end, y_pos))
+    return runs
+
 class SpriteHandler :
     def __init__ (self) :
         self.file_path = None        # Sprite image file input
@@ -60,6 +143,13 @@ class SpriteHandler :
         self.image_pixel_size = None # 1,2,4 bytes per pixel
         self.image_size = None       # image_width * image_height * 2
         self.image_buffers = None    # optional - stores individual sprite images
+        self.bits_per_pixel = None   # 1,2,4,8 for palette indexed sheets
+        self.palette = None          # RGB565 colors for indexed sheets
+        self.palette_lut = None      # source byte -> RGB565 pixels
+        self.palette_lut_inverted = None  # same, pixels right to left
+        self.lut_step = 0            # RGB565 bytes per source byte
+        self.row_buffer = None       # indexed row expansion scratch
+        self.runs_cache = {}         # (index, key, inverted): opaque runs
         self.index_dict = {}
         self.location_dict = {}
 
@@ -71,13 +161,28 @@ class SpriteHandler :
                         image_rows = 1 ,
                         image_pixel_size = 2 ,
                         variable_size = False ,
-                        buffer_width = None) :
+                        buffer_width = None ,
+                        palette = None ,
+                        bits_per_pixel = None) :
         self.buffer = sprite_buffer
         self.image_count = 0
         self.image_pixel_size = image_pixel_size
         self.buffer_byte_width = None
+        self.bits_per_pixel = None
+        self.image_buffers = None
+        self.runs_cache = {}
+        if palette is not None :
+            if bits_per_pixel is None :
+                bits_per_pixel = 1
+                while (1 << bits_per_pixel) < len (palette) :
+                    bits_per_pixel <<= 1
+            if bits_per_pixel not in (1, 2, 4, 8) :
+                raise ValueError ("raw_sprite: bits_per_pixel must be 1, 2, 4 or 8")
+            self.bits_per_pixel = bits_per_pixel
+            self.image_pixel_size = 2           # extracted images are RGB565
+            self.set_palette (palette)
         if variable_size :
-            self.buffer_byte_width = buffer_width * self.image_pixel_size
+            self.buffer_byte_width = self.row_bytes (buffer_width)
             self.image_rows = 1
             self.image_columns = buffer_width
             return
@@ -87,13 +192,121 @@ class SpriteHandler :
         self.image_width = image_width
         self.image_height = image_height
         self.image_size = image_width * image_height * self.image_pixel_size
+        self.image_rows = image_rows
+        if self.bits_per_pixel is not None :
+            sheet_rows = image_height * image_rows
+            if buf_len % sheet_rows != 0 :
+                return None
+            self.buffer_byte_width = buf_len // sheet_rows
+            if buffer_width is None :   # row padding would count as pixels
+                raise ValueError ("raw_sprite: indexed sheets need buffer_width")
+            self.image_columns = buffer_width // image_width
+            self.image_count = self.image_columns * image_rows
+            return
         if buf_len % self.image_size != 0 :
             #raise RuntimeError (f"raw_sprite: buffer length error ({buf_len})")
             return None
         self.image_count = buf_len // self.image_size
-        self.image_rows = image_rows
         self.image_columns = self.image_count // self.image_rows
         self.buffer_byte_width = image_width * self.image_columns * self.image_pixel_size
+
+    ## row_bytes - buffer bytes for a sheet row of width pixels
+    def row_bytes (self, width) :
+        if self.bits_per_pixel is None :
+            return width * self.image_pixel_size
+        return (width * self.bits_per_pixel + 7) // 8
+
+    ## set_palette - (re)build the byte -> RGB565 lookup table
+    #   palette: list of RGB565 colors, index 0 first
+    #   Swapping palettes recolors the sheet, images extracted by
+    #   buffer_images () are expanded again
+    def set_palette (self, palette) :
+        bpp = self.bits_per_pixel
+        if bpp is None :
+            raise ValueError ("set_palette: sheet is not palette indexed")
+        pixels_per_byte = 8 // bpp
+        mask = (1 << bpp) - 1
+        colors = bytearray (2 << bpp)           # RGB565 big endian per index
+        for idx, color in enumerate (palette [:mask + 1]) :
+            colors [idx * 2] = color >> 8
+            colors [idx * 2 + 1] = color & 0xff
+        step = pixels_per_byte * 2
+        lut = bytearray (256 * step)
+        lut_offset = 0
+        for value in range (0, 256) :
+            for shift in range (8 - bpp, -1, -bpp) :
+                idx = ((value >> shift) & mask) * 2
+                lut [lut_offset] = colors [idx]
+                lut [lut_offset + 1] = colors [idx + 1]
+                lut_offset += 2
+        self.palette = list (palette)
+        self.palette_lut = memoryview (lut)
+        self.palette_lut_inverted = None        # built on first use
+        self.lut_step = step
+        self.runs_cache = {}                    # key colors moved
+        if self.image_buffers is not None and self.buffer is not None :
+            self.image_buffers = None           # extract from the sheet
+            self.buffer_images ()               # re-expand
+
+    ## inverted_lut - palette_lut with the pixels of each byte reversed
+    def inverted_lut (self) :
+        if self.palette_lut_inverted is None :
+            lut = self.palette_lut
+            step = self.lut_step
+            inverted = bytearray (len (lut))
+            for lut_offset in range (0, len (lut), step) :
+                pixel_offset = lut_offset + step - 2
+                for inverted_offset in range (lut_offset, lut_offset + step, 2) :
+                    inverted [inverted_offset:(inverted_offset + 2)] \
+                        = lut [pixel_offset:(pixel_offset + 2)]
+                    pixel_offset -= 2
+            self.palette_lut_inverted = memoryview (inverted)
+        return self.palette_lut_inverted
+
+    ## expand_row - expand width indexed pixels at x_pos of a buffer row
+    #   into sprite_image at sprite_image_offset
+    #   inverted: pixels right to left (source bytes read last first
+    #   through inverted_lut)
+    def expand_row (self,
+                    sprite_image ,
+                    sprite_image_offset ,
+                    buffer_offset ,
+                    x_pos ,
+                    width ,
+                    inverted = False) :
+        bpp = self.bits_per_pixel
+        pixels_per_byte = 8 // bpp
+        bit = x_pos * bpp
+        buffer_offset += bit // 8
+        skip = (bit % 8) // bpp                  # pixels before x_pos
+        byte_count = (skip + width + pixels_per_byte - 1) // pixels_per_byte
+        if skip == 0 and width % pixels_per_byte == 0 :
+            target = sprite_image
+            target_offset = sprite_image_offset  # expand in place
+        else :
+            scratch_size = byte_count * self.lut_step
+            if self.row_buffer is None or len (self.row_buffer) < scratch_size :
+                self.row_buffer = bytearray (scratch_size)
+            target = self.row_buffer
+            target_offset = 0
+        step = self.lut_step
+        row = memoryview (self.buffer) [buffer_offset:(buffer_offset + byte_count)]
+        if inverted :
+            lut = self.inverted_lut ()
+            byte_order = range (byte_count - 1, -1, -1)
+            # pixel skip + width - 1 comes first
+            skip = byte_count * pixels_per_byte - skip - width
+        else :
+            lut = self.palette_lut
+            byte_order = range (0, byte_count)
+        for byte_idx in byte_order :
+            lut_offset = row [byte_idx] * step
+            target [target_offset:(target_offset + step)] \
+                = lut [lut_offset:(lut_offset + step)]
+            target_offset += step
+        if target is not sprite_image :
+            sprite_image [sprite_image_offset:(sprite_image_offset + width * 2)] \
+                = memoryview (target) [(skip * 2):((skip + width) * 2)]
  
     ## load_raw_file - reads raw sprite file and loads it to the buffer
     def load_raw_file (self ,
@@ -103,11 +316,15 @@ class SpriteHandler :
                         image_rows = 1 ,
                         image_pixel_size = 2 ,
                         variable_size = False ,
-                        buffer_width = None) :
+                        buffer_width = None ,
+                        palette = None ,
+                        bits_per_pixel = None) :
         #print (file_path)
         try :
             with open (file_path, "rb") as raw_file :
                 buffer = raw_file.read ()
+            if buffer [:4] == rle565.MAGIC :
+                buffer = rle565.decode (buffer) [0]  # RLE compressed sheet
         except Exception as e :
             print (file_path, e)
             return
@@ -118,7 +335,9 @@ class SpriteHandler :
                                 image_rows ,
                                 image_pixel_size ,
                                 variable_size,
-                                buffer_width)
+                                buffer_width ,
+                                palette ,
+                                bits_per_pixel)
 
     ## __getitem__ returns the indexed sprite image
     def __getitem__(self, index) :
@@ -142,6 +361,14 @@ class SpriteHandler :
                     height) :
         #print ("get_sprite:", x_pos,y_pos,width,height)
         sprite_image = bytearray (width * height * self.image_pixel_size) # returned image
+        if self.bits_per_pixel is not None :
+            buffer_offset = y_pos * self.buffer_byte_width
+            image_width = width * 2
+            for sprite_image_offset in range (0, len (sprite_image), image_width) :
+                self.expand_row (sprite_image, sprite_image_offset,
+                                buffer_offset, x_pos, width)
+                buffer_offset += self.buffer_byte_width  # Next image row in buffer
+            return sprite_image
         image_width = width * self.image_pixel_size
         buffer_offset = y_pos * image_width * self.image_columns
         buffer_offset += (x_pos * self.image_pixel_size)
@@ -160,6 +387,16 @@ class SpriteHandler :
                             width ,
                             height) :
         #print ("get_sprite_inverted:", x_pos ,y_pos ,width ,height)
+        if self.bits_per_pixel is not None :
+            # Rows last first, each expanded right to left (rotate 180)
+            sprite_image = bytearray (width * height * 2)
+            buffer_offset = (y_pos + height - 1) * self.buffer_byte_width
+            image_width = width * 2
+            for sprite_image_offset in range (0, len (sprite_image), image_width) :
+                self.expand_row (sprite_image, sprite_image_offset,
+                                buffer_offset, x_pos, width, inverted = True)
+                buffer_offset -= self.buffer_byte_width  # Previous image row in buffer
+            return sprite_image
         sprite_image = bytearray (width * height * self.image_pixel_size) # returned image
         image_width = width * self.image_pixel_size
         buffer_offset = (y_pos + (height - 1)) * image_width * self.image_columns
@@ -208,6 +445,20 @@ class SpriteHandler :
                 return self.get_sprite_inverted (x_pos, y_pos, self.image_width, self.image_height)
         else :
             return self.image_buffers [index]  # return buffered image
+    ## get_index_sprite_runs - return image and opaque runs via index
+    #   key_color: RGB565 transparent color
+    #   Runs are computed once per index, key color and orientation
+    def get_index_sprite_runs (self, index, key_color, inverted = False) :
+        sprite_image = self.get_index_sprite (index, inverted = inverted)
+        if sprite_image is None :
+            return None, None
+        cache_key = (index, key_color, inverted)
+        runs = self.runs_cache.get (cache_key)
+        if runs is None :
+            runs = opaque_runs (sprite_image, self.image_width,
+                                self.image_height, key_color)
+            self.runs_cache [cache_key] = runs
+        return sprite_image, runs
     def load_index_id (self, idx_id, index) :
         self.index_dict [idx_id] = index
     def get_index_id_sprite (self, idx_id, inverted = False) :
@@ -227,13 +478,15 @@ class SpriteHandler :
     ## buffer_images extact all images to array
     # your device may not have enough memory to use this function
     # running garbage collect is recomended after calling
+    # palette indexed sheets always keep their (small) index data, so
+    # set_palette () can recolor the extracted images
     def buffer_images (self, keep_image_buffer = False):
         if self.buffer is None :
             return
         image_buffers = []
         for index in range (0, self.image_count) :
             image_buffers.append (self.get_index_sprite (index))
-        if not keep_image_buffer :
+        if not keep_image_buffer and self.bits_per_pixel is None :
             self.buffer = None              # No longer needed
         self.image_buffers = image_buffers
                           
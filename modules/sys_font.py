@@ -24,6 +24,8 @@
 ################################################################################
 #
 
+from modules import glyph_expand
+
 ## SysFont
 
 SYSFONT = {"Width" : 5,
@@ -290,15 +292,24 @@ SYSFONT = {"Width" : 5,
 # SysFont
 #-------------------------------------------------------------------------------
 
+## sys_font_pixel is the hook that draws dots:
+##   sys_font_pixel (pix_x, pix_y, pix_color, scale = None, rows = 1)
+##   rows is only passed for runs of more than one dot, hooks with the
+##   older (pix_x, pix_y, pix_color, scale) signature are called per dot
 class SysFont :
 
     def __init__ (self ,
                   display) :
         self.display = display
         self.sys_font_pixel = self.sys_font_pixel_ili9488
+        self.pixel_rows = True       # sys_font_pixel accepts rows
         self.scale = 2               # for sysfont 
         self.text_length_max = 10    # for sysfont
         self.horizontal = True       # for sysfont
+        self.row_bits = {}           # char : transposed rows (see get_letter),
+                                     # fixed cost of at most 8 bytes per char
+        self.buffer_size = 4096      # text buffer bytes without image_buffers
+        self.text_buffer = None
 
     #----
     #---- Called after the displays are initialized
@@ -331,16 +342,59 @@ class SysFont :
 
     def sys_font_pixel (self) :
         pass
-    ## sys_font_pixel_ili9488 - draw filled rectangle
-    def sys_font_pixel_ili9488 (self, pix_x, pix_y, pix_color, scale = None) :
+    ## sys_font_pixel_ili9488 - draw filled rectangle, rows dots high
+    def sys_font_pixel_ili9488 (self, pix_x, pix_y, pix_color, scale = None ,
+                                rows = 1) :
         font_scale = self.scale
         if scale is not None :
             font_scale = scale
         self.display.fill_rectangle (x = pix_x ,
                                     y = pix_y ,
                                     w = font_scale ,
-                                    h = font_scale ,
+                                    h = font_scale * rows ,
                                     color = pix_color)
+    ## sys_font_run - draw run dots down from pix_x, pix_y
+    def sys_font_run (self, pix_x, pix_y, pix_color, scale, run) :
+        if run > 1 and self.pixel_rows :
+            try :
+                self.sys_font_pixel (pix_x = pix_x ,
+                                     pix_y = pix_y ,
+                                     pix_color = pix_color ,
+                                     scale = scale ,
+                                     rows = run)
+                return
+            except TypeError :
+                self.pixel_rows = False  # older hook, draw dot by dot
+        for _ in range (run) :
+            self.sys_font_pixel (pix_x = pix_x ,
+                                 pix_y = pix_y ,
+                                 pix_color = pix_color ,
+                                 scale = scale)
+            pix_y += scale
+    ## get_letter - RGB565 pixels of a 5 x 8 character, scaled 1 to 8
+    ## returns (buffer, width, height), rows expanded by glyph_expand
+    def get_letter (self ,
+                    char ,
+                    text_color = 0 ,
+                    background = 0 ,
+                    scale = 1) :
+        if ord (char) > SYSFONT["End"] or \
+           (ord (char) + 1) * 5 > len (SYSFONT["Data"]) :
+            char = "?"                   # invalid (or past the font data)
+        rows = self.row_bits.get (char)
+        if rows is None :                # transpose columns once
+            sysfont_idx = ord (char) * 5
+            rows = glyph_expand.columns_to_rows (
+                        SYSFONT["Data"] [sysfont_idx : sysfont_idx + 5], 5, 8)
+            self.row_bits [char] = rows
+        buf = bytearray (5 * 8 * scale * scale * 2)
+        glyph_expand.expand_rows_scaled (rows, 5, 8, scale ,
+                                         text_color, background, buf)
+        return buf, 5 * scale, 8 * scale
+    ## text_sysfont - background None draws the set dots only (one
+    ## fill_rectangle per vertical run of dots in a column), with a
+    ## background color characters are drawn as blocks (see
+    ## text_sysfont_buffered)
     def text_sysfont (self ,
                         x_char ,
                         y_char ,
@@ -348,6 +402,7 @@ class SysFont :
                         text_color = 0 ,
                         scale = None ,
                         horizontal = True ,
+                        background = None ,
                         ) :
         #x_char = self.xmin                   # first char position
         #y_char = self.ymin
@@ -357,6 +412,27 @@ class SysFont :
             font_scale = scale
         if horizontal is not None :
             view_horizontal = horizontal
+        if background is not None :
+            if hasattr (self.display, "block") and \
+               font_scale <= glyph_expand.MAX_SCALE :
+                self.text_sysfont_buffered (x_char, y_char, text ,
+                                            text_color, background ,
+                                            font_scale, view_horizontal)
+                return
+            # no block writes (or scale > 8): paint the character cells,
+            # then the dots
+            if view_horizontal :
+                self.display.fill_rectangle (x = x_char ,
+                                             y = y_char ,
+                                             w = len (text) * font_scale * 6 ,
+                                             h = font_scale * 8 ,
+                                             color = background)
+            else :
+                self.display.fill_rectangle (x = x_char ,
+                                             y = y_char ,
+                                             w = font_scale * 5 ,
+                                             h = len (text) * font_scale * 9 ,
+                                             color = background)
         for char in text :
             if ord (char) > SYSFONT["End"] :
                 char = "?"                   # invalid
@@ -365,27 +441,93 @@ class SysFont :
             for byte_idx in range (0,5) :    # font columns
                 col_bits = SYSFONT["Data"] [sysfont_idx + byte_idx] # col bits
                 y_dot = y_char
-                for col_idx in range (0,8) : # font rows
-                    if col_bits == 0 :
-                        break                # no more dots
+                while col_bits != 0 :        # until no more dots
                     if col_bits & 0x01 != 0 :
-                        self.sys_font_pixel (pix_x = x_dot ,
-                                             pix_y = y_dot ,
-                                             pix_color = text_color ,
-                                             scale = font_scale)
-                        '''
-                        self.display.fill_rectangle (x = x_dot ,
-                                                            w = font_scale ,
-                                                            y = y_dot ,
-                                                            h = font_scale ,
-                                                            color = text_color)
-                        '''
-                    col_bits >>= 1           # next col bit
-                    y_dot += font_scale      # next row
+                        run = 0              # dots in this run
+                        while col_bits & 0x01 != 0 :
+                            run += 1
+                            col_bits >>= 1
+                        self.sys_font_run (x_dot, y_dot, text_color ,
+                                           font_scale, run)
+                        y_dot += font_scale * run
+                    else :
+                        col_bits >>= 1       # next col bit
+                        y_dot += font_scale  # next row
                 x_dot += font_scale          # next col
             if view_horizontal :
                 x_char += (font_scale * 6)       # next character position
             else :
                 y_char += (font_scale * 9)       # next character position
 
+    ## text_sysfont_buffered - characters and the gaps after them are
+    ## assembled in an RGB565 buffer and sent with one display.block per
+    ## strip, strips are as many characters as fit in the buffer
+    ## (the display's second image chunk buffer if it has image_buffers,
+    ## shared with draw_text and read_block, so it is only used during
+    ## the call)
+    def text_sysfont_buffered (self ,
+                               x_char ,
+                               y_char ,
+                               text ,
+                               text_color ,
+                               background ,
+                               font_scale ,
+                               view_horizontal = True) :
+        char_w = font_scale * 5
+        char_h = font_scale * 8
+        if view_horizontal :
+            cell_w = char_w + font_scale     # char + gap columns
+            cell_h = char_h
+        else :
+            cell_w = char_w
+            cell_h = char_h + font_scale     # char + gap rows
+        cell_bytes = cell_w * cell_h * 2
+        gap = background.to_bytes (2, "big") * (cell_w * font_scale)
+        if hasattr (self.display, "image_buffers") :
+            buf = self.display.image_buffers () [1]
+        else :
+            if self.text_buffer is None :
+                self.text_buffer = memoryview (bytearray (self.buffer_size))
+            buf = self.text_buffer
+        per_strip = len (buf) // cell_bytes
+        if per_strip == 0 :                  # cell larger than the buffer
+            buf = memoryview (bytearray (cell_bytes))
+            per_strip = 1
+        for start in range (0, len (text), per_strip) :
+            chars = text [start : start + per_strip]
+            if view_horizontal :
+                strip_w = len (chars) * cell_w
+                for char_idx in range (len (chars)) :
+                    glyph = memoryview (self.get_letter (chars [char_idx] ,
+                                                         text_color ,
+                                                         background ,
+                                                         font_scale) [0])
+                    pos = char_idx * cell_w * 2
+                    for row in range (0, len (glyph), char_w * 2) :
+                        buf [pos : pos + char_w * 2] = glyph [row : row + char_w * 2]
+                        buf [pos + char_w * 2 : pos + cell_w * 2] = gap [: font_scale * 2]
+                        pos += strip_w * 2
+                self.display.block (x_char ,
+                                    y_char ,
+                                    x_char + strip_w - 1 ,
+                                    y_char + cell_h - 1 ,
+                                    buf [: strip_w * cell_h * 2])
+                x_char += strip_w
+            else :
+                pos = 0
+                for char in chars :
+                    glyph = self.get_letter (char, text_color, background ,
+                                             font_scale) [0]
+                    buf [pos : pos + len (glyph)] = glyph
+                    pos += len (glyph)
+                    buf [pos : pos + len (gap)] = gap
+                    pos += len (gap)
+                strip_h = len (chars) * cell_h
+                self.display.block (x_char ,
+                                    y_char ,
+                                    x_char + cell_w - 1 ,
+                                    y_char + strip_h - 1 ,
+                                    buf [: pos])
+                y_char += strip_h
+
 ## end SysFont ##
@@ -1,16 +1,40 @@
-"""XGLCD Font Utility."""
-from math import ceil, floor
+"""XGLCD Font Utility.
+
+Binary font files hold the same glyph data precompiled, so fonts load
+without parsing and glyphs can be read from flash as they are drawn.
+
+Binary file format (all values little endian):
+    Header: b'XGF1', width (uint8), height (uint8), start letter (uint16),
+        letter count (uint16)
+    Letter widths: letter count * uint8
+    Letter offsets: letter count * uint32, file offsets of the glyphs
+    Glyphs: width * height bytes ((height + 7) // 8) bytes per column,
+        X-GLCD column order without the padding columns
+
+Convert X-GLCD C files on the host with:
+    python3 -m modules.xglcd_font font.c width height [font.xfb]
+"""
+from math import floor
+from struct import pack, unpack
+from modules import glyph_expand
+from modules.lru_cache import LruCache
+
+MAGIC = b'XGF1'
+HEADER_SIZE = 10
 
 
 class XglcdFont(object):
     """Font data in X-GLCD format.
 
     Attributes:
-        letters: A bytearray of letters (columns consist of bytes)
+        letters: A bytearray of letters (columns consist of bytes), None
+            for binary fonts
+        widths: Pixel width of each letter
         width: Maximum pixel width of font
         height: Pixel height of font
         start_letter: ASCII number of first letter
         height_bytes: How many bytes comprises letter height
+        cache: LruCache of rendered letters and transposed letter rows
 
     Note:
         Font files can be generated with the free version of MikroElektronika
@@ -18,21 +42,38 @@ class XglcdFont(object):
         The font file must be in X-GLCD 'C' format.
         To save text files from this font creator program in Win7 or higher
         you must use XP compatibility mode or you can just use the clipboard.
+        Binary font files (see save_binary) load much faster.
     """
 
-    # Dict to tranlate bitwise values to byte position
-    BIT_POS = {1: 0, 2: 2, 4: 4, 8: 6, 16: 8, 32: 10, 64: 12, 128: 14, 256: 16}
-
-    def __init__(self, path, width, height, start_letter=32, letter_count=96):
+    def __init__(self, path, width=None, height=None, start_letter=32,
+                 letter_count=96, cache=8192, lazy=True):
         """Constructor for X-GLCD Font object.
 
         Args:
-            path (string): Full path of font file
+            path (string): Full path of font file (C or binary)
             width (int): Maximum width in pixels of each letter
             height (int): Height in pixels of each letter
             start_letter (int): First ACII letter.  Default is 32.
             letter_count (int): Total number of letters.  Default is 96.
+            cache (int): Bytes of RAM for rendered letters and their
+                transposed rows.  Default is 8192, 0 disables the cache.
+            lazy (bool): Read the glyphs of binary fonts from the file as
+                they are drawn.  Default is True.
+        Note:
+            Width, height, start_letter and letter_count of binary fonts
+            are read from the file.
         """
+        self.cache = LruCache(cache)
+        self.file = None  # Open binary font file (lazy loading)
+        self.glyphs = None  # Glyph data of binary fonts loaded to RAM
+        self.letters = None
+        with open(path, 'rb') as f:
+            binary = f.read(4) == MAGIC
+        if binary:
+            self.__load_binary_font(path, lazy)
+            return
+        if width is None or height is None:
+            raise ValueError('Width and height of C fonts are required.')
         self.width = width
         self.height = max(height, 8)
         self.start_letter = start_letter
@@ -40,6 +81,42 @@ class XglcdFont(object):
         self.bytes_per_letter = (floor(
             (self.height - 1) / 8) + 1) * self.width + 1
         self.__load_xglcd_font(path)
+        bytes_per_letter = self.bytes_per_letter
+        self.widths = bytes(self.letters[i * bytes_per_letter]
+                            for i in range(letter_count))
+
+    def __load_binary_font(self, path, lazy):
+        """Load the header and tables of a binary font file.
+
+        Args:
+            path (string): Full path of font file.
+            lazy (bool): Keep the file open and read glyphs on demand.
+        """
+        f = open(path, 'rb')
+        try:
+            (_, self.width, self.height, self.start_letter,
+             self.letter_count) = unpack('<4sBBHH', f.read(HEADER_SIZE))
+            count = self.letter_count
+            self.widths = f.read(count)
+            self.offsets = unpack('<{0}I'.format(count), f.read(count * 4))
+            height_bytes = (self.height - 1) // 8 + 1
+            self.bytes_per_letter = height_bytes * self.width + 1
+            if lazy:
+                # Reused for each glyph read
+                self.record = bytearray(self.bytes_per_letter - 1)
+                self.file = f
+                return
+            self.glyphs = f.read()
+            self.glyph_start = HEADER_SIZE + count * 5
+        finally:
+            if self.file is None:
+                f.close()
+
+    def close(self):
+        """Close the file of a lazily loaded binary font."""
+        if self.file is not None:
+            self.file.close()
+            self.file = None
 
     def __load_xglcd_font(self, path):
         """Load X-GLCD font data from text file.
@@ -70,86 +147,147 @@ class XglcdFont(object):
                     int(b, 16) for b in line.split(','))
                 offset += bytes_per_letter
 
-    def lit_bits(self, n):
-        """Return positions of 1 bits only."""
-        while n:
-            b = n & (~n+1)
-            yield self.BIT_POS[b]
-            n ^= b
-
-    def get_letter(self, letter, color, background=0, landscape=False):
+    def get_letter(self, letter, color, background=0, landscape=False,
+                   scale=1):
         """Convert letter byte data to pixels.
 
         Args:
-            letter (string): Letter to return (must exist within font).
+            letter (string): Letter to return.
             color (int): RGB565 color value.
             background (int): RGB565 background color (default: black).
             landscape (bool): Orientation (default: False = portrait)
+            scale (int): Integer scale factor 1 (default) to 8
         Returns:
             (bytearray): Pixel data.
-            (int, int): Letter width and height.
+            (int, int): Letter width and height (scaled).
+            Empty data and 0, 0 if the font does not contain the letter.
+        Note:
+            Pixels are expanded a byte at a time (see glyph_expand).
+            Pixel data is cached by letter, colors, orientation and scale
+            (see cache_stats).  It is shared and must not be modified.
         """
+        key = (letter, color, background, landscape, scale)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
         # Get index of letter
         letter_ord = ord(letter) - self.start_letter
-        # Confirm font contains letter
-        if letter_ord >= self.letter_count:
-            print('Font does not contain character: ' + letter)
+        # Letters missing from the font are skipped (draw_text reports)
+        if not 0 <= letter_ord < self.letter_count:
             return b'', 0, 0
-        bytes_per_letter = self.bytes_per_letter
-        offset = letter_ord * bytes_per_letter
-        mv = memoryview(self.letters[offset:offset + bytes_per_letter])
-
-        # Get width of letter (specified by first byte)
-        letter_width = mv[0]
+        letter_width = self.widths[letter_ord]
         letter_height = self.height
-        # Get size in bytes of specified letter
-        letter_size = letter_height * letter_width
+        if scale != 1:
+            scaled = self._scaled_letter(letter_ord, color, background,
+                                         landscape, scale)
+            return self.cache.put(key, scaled, len(scaled[0]))
         # Create buffer (double size to accommodate 16 bit colors)
-        if background:
-            buf = bytearray(background.to_bytes(2, 'big') * letter_size)
+        buf = bytearray(letter_height * letter_width * 2)
+        lut = glyph_expand.table(color, background)
+        if landscape:
+            # Columns are rows in landscape, first column at the bottom
+            mv = self._columns(letter_ord, letter_width)
+            height_bytes = (letter_height + 7) >> 3
+            pos = len(buf)
+            for i in range(0, letter_width * height_bytes, height_bytes):
+                pos -= letter_height * 2
+                glyph_expand.expand(lut, mv[i:i + height_bytes],
+                                    letter_height, buf, pos)
         else:
-            buf = bytearray(letter_size * 2)
+            glyph_expand.expand_rows(lut, self._rows(letter_ord, letter_width),
+                                     letter_width, letter_height, buf)
+
+        return self.cache.put(key, (buf, letter_width, letter_height),
+                              len(buf))
 
-        msb, lsb = color.to_bytes(2, 'big')
+    def _scaled_letter(self, letter_ord, color, background, landscape,
+                       scale):
+        """Return scaled letter pixels (see get_letter).
 
+        Args:
+            letter_ord (int): Letter index.
+            color (int): RGB565 color value.
+            background (int): RGB565 background color.
+            landscape (bool): Orientation.
+            scale (int): Integer scale factor.
+        Returns:
+            (bytearray): Pixel data.
+            (int, int): Scaled letter width and height.
+        """
+        letter_width = self.widths[letter_ord]
+        letter_height = self.height
         if landscape:
-            # Populate buffer in order for landscape
-            pos = (letter_size * 2) - (letter_height * 2)
-            lh = letter_height
-            # Loop through letter byte data and convert to pixel data
-            for b in mv[1:]:
-                # Process only colored bits
-                for bit in self.lit_bits(b):
-                    buf[bit + pos] = msb
-                    buf[bit + pos + 1] = lsb
-                if lh > 8:
-                    # Increment position by double byte
-                    pos += 16
-                    lh -= 8
-                else:
-                    # Descrease position to start of previous column
-                    pos -= (letter_height * 4) - (lh * 2)
-                    lh = letter_height
+            # Landscape rows are the columns, last column first
+            height_bytes = (letter_height + 7) >> 3
+            mv = self._columns(letter_ord, letter_width)
+            rows = bytearray(letter_width * height_bytes)
+            i = len(rows)
+            for c in range(0, letter_width * height_bytes, height_bytes):
+                i -= height_bytes
+                rows[i:i + height_bytes] = mv[c:c + height_bytes]
+            w, h = letter_height, letter_width
         else:
-            # Populate buffer in order for portrait
-            col = 0  # Set column to first column
-            bytes_per_letter = ceil(letter_height / 8)
-            letter_byte = 0
-            # Loop through letter byte data and convert to pixel data
-            for b in mv[1:]:
-                # Process only colored bits
-                segment_size = letter_byte * letter_width * 16
-                for bit in self.lit_bits(b):
-                    pos = (bit * letter_width) + (col * 2) + segment_size
-                    buf[pos] = msb
-                    pos = (bit * letter_width) + (col * 2) + 1 + segment_size
-                    buf[pos] = lsb
-                letter_byte += 1
-                if letter_byte + 1 > bytes_per_letter:
-                    col += 1
-                    letter_byte = 0
-
-        return buf, letter_width, letter_height
+            rows = self._rows(letter_ord, letter_width)
+            w, h = letter_width, letter_height
+        buf = bytearray(w * h * scale * scale * 2)
+        glyph_expand.expand_rows_scaled(rows, w, h, scale, color, background,
+                                        buf)
+        return buf, letter_width * scale, letter_height * scale
+
+    def _columns(self, letter_ord, letter_width):
+        """Return the column bytes of a letter.
+
+        Args:
+            letter_ord (int): Letter index.
+            letter_width (int): Letter width in pixels.
+        Returns:
+            (memoryview): Column bytes (C fonts include padding columns).
+        """
+        if self.letters is not None:
+            bytes_per_letter = self.bytes_per_letter
+            offset = letter_ord * bytes_per_letter
+            return memoryview(self.letters)[offset + 1:
+                                            offset + bytes_per_letter]
+        size = letter_width * ((self.height - 1) // 8 + 1)
+        offset = self.offsets[letter_ord]
+        if self.file is None:
+            offset -= self.glyph_start
+            return memoryview(self.glyphs)[offset:offset + size]
+        mv = memoryview(self.record)[:size]
+        self.file.seek(offset)
+        self.file.readinto(mv)
+        return mv
+
+    def _rows(self, letter_ord, letter_width):
+        """Return the row bytes of a letter, transposed on first use.
+
+        Args:
+            letter_ord (int): Letter index.
+            letter_width (int): Letter width in pixels.
+        Returns:
+            (bytearray): Row bytes (see glyph_expand.columns_to_rows).
+        Note:
+            Rows are kept in the letter cache, within its budget.
+        """
+        key = ('rows', letter_ord)
+        rows = self.cache.get(key)
+        if rows is None:
+            rows = self.cache.put(key, glyph_expand.columns_to_rows(
+                self._columns(letter_ord, letter_width), letter_width,
+                self.height))
+        return rows
+
+    def cache_stats(self):
+        """Return rendered letter cache statistics.
+
+        Returns:
+            dict: Entries, size, budget, hits, misses and evictions.
+        """
+        return self.cache.stats()
+
+    def clear_cache(self):
+        """Free the rendered letters (e.g. before a large allocation)."""
+        self.cache.clear()
 
     def measure_text(self, text, spacing=1):
         """Measure length of text string in pixels.
@@ -161,10 +299,48 @@ class XglcdFont(object):
             int: length of text
         """
         length = 0
+        widths = self.widths
+        start_letter = self.start_letter
         for letter in text:
-            # Get index of letter
-            letter_ord = ord(letter) - self.start_letter
-            offset = letter_ord * self.bytes_per_letter
             # Add length of letter and spacing
-            length += self.letters[offset] + spacing
+            length += widths[ord(letter) - start_letter] + spacing
         return length
+
+    def save_binary(self, path):
+        """Save the font as a binary font file.
+
+        Args:
+            path (string): Binary font file path.
+        """
+        count = self.letter_count
+        height_bytes = (self.height - 1) // 8 + 1
+        offset = HEADER_SIZE + count * 5
+        offsets = []
+        glyphs = []
+        for i in range(count):
+            size = self.widths[i] * height_bytes
+            # Without the padding columns of C fonts
+            columns = bytes(self._columns(i, self.widths[i])[:size])
+            offsets.append(offset)
+            glyphs.append(columns)
+            offset += len(columns)
+        with open(path, 'wb') as f:
+            f.write(pack('<4sBBHH', MAGIC, self.width, self.height,
+                         self.start_letter, count))
+            f.write(bytes(self.widths))
+            f.write(pack('<{0}I'.format(count), *offsets))
+            for columns in glyphs:
+                f.write(columns)
+
+
+if __name__ == '__main__':
+    import sys
+    if len(sys.argv) < 4:
+        print('usage: xglcd_font.py font.c width height [font.xfb]')
+        sys.exit(1)
+    c_path = sys.argv[1]
+    xfb_path = sys.argv[4] if len(sys.argv) > 4 else \
+        c_path.rsplit('.', 1)[0] + '.xfb'
+    c_font = XglcdFont(c_path, int(sys.argv[2]), int(sys.argv[3]), cache=0)
+    c_font.save_binary(xfb_path)
+    print('{0}: {1} letters'.format(xfb_path, c_font.letter_count))
@@ -0,0 +1,5 @@
+"""Run the host tests from the repository root (see modules/emulator.py)."""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,154 @@
+"""Regression checks of drawing on the emulated panel."""
+import os
+
+from modules.emulator import create_display
+from modules.sys_font import SYSFONT
+
+WHITE = 0xFFFF
+BLUE = 0x001F
+
+
+def glyph_pixels(letter, x0, y0, color, background):
+    """Expected pixels of a SysFont letter in an 8x8 cell."""
+    data = SYSFONT["Data"]
+    c = ord(letter) * 5
+    pixels = {}
+    for x in range(8):
+        column = data[c + x] if x < 5 else 0
+        for y in range(8):
+            pixels[x0 + x, y0 + y] = color if column >> y & 1 else background
+    return pixels
+
+
+def test_text8x8_host_font():
+    display, panel = create_display()
+    display.draw_text8x8(10, 20, 'Hi!', WHITE, BLUE)
+    for i, letter in enumerate('Hi!'):
+        expected = glyph_pixels(letter, 10 + i * 8, 20, WHITE, BLUE)
+        for (x, y), color in expected.items():
+            assert panel.pixel(x, y) == color, (letter, x, y)
+
+
+def test_text8x8_rotate():
+    display, panel = create_display()
+    display.draw_text8x8(100, 100, 'Ab', WHITE, BLUE, rotate=180)
+    # 180 degrees: the last letter, upside down, comes first
+    expected = glyph_pixels('b', 0, 0, WHITE, BLUE)
+    for (x, y), color in expected.items():
+        assert panel.pixel(100 + 7 - x, 100 + 7 - y) == color
+
+
+def test_text8x8_clipped():
+    display, panel = create_display()
+    display.draw_text8x8(316, 236, 'Ab', WHITE, BLUE)
+    expected = glyph_pixels('A', 316, 236, WHITE, BLUE)
+    for (x, y), color in expected.items():
+        if x < 320 and y < 240:
+            assert panel.pixel(x, y) == color
+
+
+def test_stats_overlay():
+    from modules.display_stats import DisplayStats
+    display, panel = create_display()
+    stats = DisplayStats(display)
+    stats.enable()
+    display.fill_rectangle(0, 0, 100, 100, WHITE)
+    calls = stats.stats()
+    stats.draw_overlay(0, 200, WHITE, BLUE)
+    stats.disable()
+    assert stats.stats() == calls  # Overlay drawing is not recorded
+    text = '{0:5.1f}fps'.format(stats.fps)
+    for i, letter in enumerate(text):
+        expected = glyph_pixels(letter, i * 8, 200, WHITE, BLUE)
+        for (x, y), color in expected.items():
+            assert panel.pixel(x, y) == color
+
+
+def test_stats_skip_pins():
+    from modules.display_stats import DisplayStats
+    display, panel = create_display()
+    cs, dc = display.cs, display.dc
+    stats = DisplayStats(display)
+    stats.enable()
+    assert display.cs is cs and display.dc is dc
+    display.fill_rectangle(0, 0, 10, 10, WHITE)
+    names = stats.stats()
+    stats.disable()
+    assert 'cs' not in names and 'dc' not in names
+    assert 'fill_rectangle' in names and 'write_window' in names
+
+
+def test_sysfont_legacy_pixel_hook():
+    from modules.sys_font import SysFont
+    display, panel = create_display()
+    expected, expected_panel = create_display()
+    SysFont(expected).text_sysfont(0, 0, 'Hello', WHITE, scale=2)
+    font = SysFont(display)
+    calls = []
+
+    def legacy(pix_x, pix_y, pix_color, scale=None):
+        calls.append((pix_x, pix_y))
+        display.fill_rectangle(pix_x, pix_y, scale, scale, pix_color)
+    font.sys_font_pixel = legacy
+    font.text_sysfont(0, 0, 'Hello', WHITE, scale=2)
+    assert panel.ram == expected_panel.ram
+    assert len(calls) == len(set(calls))  # One call per dot
+
+
+def pipeline_scene(display, image_path):
+    from modules.xglcd_font import XglcdFont
+    font = XglcdFont(os.path.join(os.path.dirname(__file__), '..', 'modules',
+                                  'Unispace12x24.c'), 12, 24)
+    display.clear(BLUE)
+    display.draw_image(image_path, 10, 10, 100, 60)
+    display.draw_image(image_path, 280, -20, 100, 60)  # Clipped
+    display.draw_text(0, 100, 'Pipelined text', font, WHITE, BLUE)
+    display.draw_text(200, 230, 'Up', font, WHITE, 0, landscape=True)
+    display.draw_text(150, 150, 'Turn', font, WHITE, 0, rotate_180=True)
+    display.draw_text8x8(0, 200, 'Band pipeline', WHITE, 0)
+    display.fill_circle(250, 120, 40, 0xF800)
+    display.draw_pixel(5, 230, 0x07E0)
+
+
+def test_pipeline_matches_direct(tmp_path):
+    image_path = str(tmp_path / 'image.raw')
+    with open(image_path, 'wb') as f:
+        f.write(bytes(range(256)) * (100 * 60 * 2 // 256 + 1))
+    surfaces = []
+    for mode in (None, False, True):
+        display, panel = create_display()
+        if mode is not None:
+            display.enable_pipeline(size=1024, threaded=mode)
+            assert display.pipeline.threaded == mode
+        pipeline_scene(display, image_path)
+        display.disable_pipeline()
+        surfaces.append(bytes(panel.ram))
+    assert surfaces[1] == surfaces[0]
+    assert surfaces[2] == surfaces[0]
+
+
+def test_pipeline_worker_error():
+    from modules.pipeline import BandPipeline
+    sent = []
+
+    def send(x0, y0, x1, y1, data, offset, stride):
+        if not sent:
+            sent.append(None)
+            raise OSError('SPI failed')
+        sent.append(bytes(data))
+    pipeline = BandPipeline(send, size=64)
+    if not pipeline.threaded:
+        return  # No _thread on this port
+    pipeline.acquire()[:4] = b'\x01\x02\x03\x04'
+    pipeline.submit(0, 0, 1, 0, 4)
+    try:
+        pipeline.drain()
+    except OSError:
+        pass
+    else:
+        assert False, 'worker error not raised by drain()'
+    pipeline.drain()  # Error reported once, pipeline still usable
+    pipeline.acquire()[:4] = b'\x05\x06\x07\x08'
+    pipeline.submit(0, 0, 1, 0, 4)
+    pipeline.close()
+    assert sent == [None, b'\x05\x06\x07\x08']
@@ -0,0 +1,159 @@
+"""Run-based outlines match the per-pixel algorithms they replaced.
+
+The reference functions below are the draw_circle, draw_ellipse and
+draw_line loops of the original driver, drawing one draw_pixel() per
+point.  Both versions draw on emulated panels and the panel frame
+memories are compared.
+"""
+import random
+
+from modules.emulator import create_display
+
+RED = 0xF800
+
+
+def circle_pixels(display, x0, y0, r, color):
+    """Original per-pixel draw_circle."""
+    f = 1 - r
+    dx = 1
+    dy = -r - r
+    x = 0
+    y = r
+    display.draw_pixel(x0, y0 + r, color)
+    display.draw_pixel(x0, y0 - r, color)
+    display.draw_pixel(x0 + r, y0, color)
+    display.draw_pixel(x0 - r, y0, color)
+    while x < y:
+        if f >= 0:
+            y -= 1
+            dy += 2
+            f += dy
+        x += 1
+        dx += 2
+        f += dx
+        display.draw_pixel(x0 + x, y0 + y, color)
+        display.draw_pixel(x0 - x, y0 + y, color)
+        display.draw_pixel(x0 + x, y0 - y, color)
+        display.draw_pixel(x0 - x, y0 - y, color)
+        display.draw_pixel(x0 + y, y0 + x, color)
+        display.draw_pixel(x0 - y, y0 + x, color)
+        display.draw_pixel(x0 + y, y0 - x, color)
+        display.draw_pixel(x0 - y, y0 - x, color)
+
+
+def ellipse_pixels(display, x0, y0, a, b, color):
+    """Original per-pixel draw_ellipse."""
+    a2 = a * a
+    b2 = b * b
+    twoa2 = a2 + a2
+    twob2 = b2 + b2
+    x = 0
+    y = b
+    px = 0
+    py = twoa2 * y
+    display.draw_pixel(x0 + x, y0 + y, color)
+    display.draw_pixel(x0 - x, y0 + y, color)
+    display.draw_pixel(x0 + x, y0 - y, color)
+    display.draw_pixel(x0 - x, y0 - y, color)
+    p = round(b2 - (a2 * b) + (0.25 * a2))
+    while px < py:
+        x += 1
+        px += twob2
+        if p < 0:
+            p += b2 + px
+        else:
+            y -= 1
+            py -= twoa2
+            p += b2 + px - py
+        display.draw_pixel(x0 + x, y0 + y, color)
+        display.draw_pixel(x0 - x, y0 + y, color)
+        display.draw_pixel(x0 + x, y0 - y, color)
+        display.draw_pixel(x0 - x, y0 - y, color)
+    p = round(b2 * (x + 0.5) * (x + 0.5) +
+              a2 * (y - 1) * (y - 1) - a2 * b2)
+    while y > 0:
+        y -= 1
+        py -= twoa2
+        if p > 0:
+            p += a2 - py
+        else:
+            x += 1
+            px += twob2
+            p += a2 - py + px
+        display.draw_pixel(x0 + x, y0 + y, color)
+        display.draw_pixel(x0 - x, y0 + y, color)
+        display.draw_pixel(x0 + x, y0 - y, color)
+        display.draw_pixel(x0 - x, y0 - y, color)
+
+
+def line_pixels(display, x1, y1, x2, y2, color):
+    """Original per-pixel Bresenham loop of draw_line (sloped lines)."""
+    is_steep = abs(y2 - y1) > abs(x2 - x1)
+    if is_steep:
+        x1, y1 = y1, x1
+        x2, y2 = y2, x2
+    if x1 > x2:
+        x1, x2 = x2, x1
+        y1, y2 = y2, y1
+    dx = x2 - x1
+    dy = y2 - y1
+    error = dx >> 1
+    ystep = 1 if y1 < y2 else -1
+    y = y1
+    for x in range(x1, x2 + 1):
+        if not is_steep:
+            display.draw_pixel(x, y, color)
+        else:
+            display.draw_pixel(y, x, color)
+        error -= abs(dy)
+        if error < 0:
+            y += ystep
+            error += dx
+
+
+def compare(draw, reference, cases):
+    """Draw each case both ways and return the cases that differ."""
+    display, panel = create_display()
+    expected, reference_panel = create_display()
+    bad = []
+    for args in cases:
+        display.clear()
+        expected.clear()
+        draw(display, *args)
+        reference(expected, *args)
+        if panel.ram != reference_panel.ram:
+            bad.append(args)
+    return bad
+
+
+def test_circle():
+    rand = random.Random(1)
+    cases = [(160, 120, r, RED) for r in (0, 1, 2, 3, 7, 50, 119)]
+    # Partly off screen
+    cases += [(rand.randint(-40, 360), rand.randint(-40, 280),
+               rand.randint(1, 90), RED) for _ in range(20)]
+    assert compare(lambda d, *a: d.draw_circle(*a), circle_pixels,
+                   cases) == []
+
+
+def test_ellipse():
+    rand = random.Random(2)
+    cases = [(160, 120, a, b, RED) for a, b in
+             ((1, 1), (1, 30), (30, 1), (100, 40), (40, 100), (60, 60))]
+    cases += [(rand.randint(-40, 360), rand.randint(-40, 280),
+               rand.randint(1, 120), rand.randint(1, 120), RED)
+              for _ in range(20)]
+    assert compare(lambda d, *a: d.draw_ellipse(*a), ellipse_pixels,
+                   cases) == []
+
+
+def test_line():
+    rand = random.Random(3)
+    cases = [(0, 0, 319, 239, RED), (319, 0, 0, 239, RED),
+             (10, 10, 11, 200, RED), (10, 10, 300, 11, RED)]
+    while len(cases) < 40:
+        x1, x2 = rand.randint(0, 319), rand.randint(0, 319)
+        y1, y2 = rand.randint(0, 239), rand.randint(0, 239)
+        if x1 != x2 and y1 != y2:
+            cases.append((x1, y1, x2, y2, RED))
+    assert compare(lambda d, *a: d.draw_line(*a), line_pixels, cases) == []